@@ -1,22 +1,25 @@
 """
 Телеграм-бот для парсинга VC-каналов и авторазметки ролей (ментор/инвестор/ангел/основатель/сотрудник).
-Работает локально через long-polling и может быть запущен на Vercel через вебхук.
+Работает локально через long-polling, через встроенный вебхук-сервер (если задан WEBHOOK_URL)
+и может быть запущен на Vercel через api/webhook.py.
 """
 
 import asyncio
-import json
+import io
 import logging
 import os
+import time
 from datetime import datetime
-from typing import Dict, List
+from typing import Callable, Dict, Hashable, List, TypeVar
 
-import pandas as pd
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.ext import Application, CallbackQueryHandler, CommandHandler, ContextTypes
 
-from advanced_parser import AdvancedVCParser, load_config
+from advanced_parser import DEFAULT_PARSE_CONCURRENCY, AdvancedVCParser, load_config
+from config_cache import load_json_cached
 from classifier import VCClassifier
 from database import VCDatabase
+from parser_common import write_records_xlsx
 from scheduler import ParsingScheduler
 
 logging.basicConfig(
@@ -27,15 +30,22 @@ logger = logging.getLogger(__name__)
 
 services_lock = asyncio.Lock()
 
+# Сколько секунд живут закэшированные ответы /people, /projects и /stats.
+QUERY_CACHE_TTL = 30
+
+# Столбцы, которые нужны для списков /projects и /people в чате.
+PROJECT_LIST_COLUMNS = ("project_name", "investment_stage", "theme")
+PEOPLE_LIST_COLUMNS = ("person_name", "position", "company", "classification")
+
+T = TypeVar("T")
+
 
 def load_bot_token() -> str:
     env_token = os.getenv("BOT_TOKEN")
     if env_token:
         return env_token
     try:
-        with open("bot_config.json", "r", encoding="utf-8") as f:
-            data = json.load(f)
-            return data.get("bot_token", "")
+        return load_json_cached("bot_config.json").get("bot_token", "")
     except FileNotFoundError:
         return ""
 
@@ -79,6 +89,22 @@ async def ensure_services(application: Application) -> Dict:
         return services
 
 
+def cached_query(application: Application, key: Hashable, loader: Callable[[], T]) -> T:
+    """Возвращает результат запроса к БД из кэша в bot_data, если он моложе QUERY_CACHE_TTL."""
+    cache = application.bot_data.setdefault("query_cache", {})
+    now = time.monotonic()
+    entry = cache.get(key)
+    if entry and entry[0] > now:
+        return entry[1]
+    value = loader()
+    cache[key] = (now + QUERY_CACHE_TTL, value)
+    return value
+
+
+def invalidate_query_cache(application: Application):
+    application.bot_data.pop("query_cache", None)
+
+
 # --------------------------- команды бота --------------------------- #
 
 
@@ -126,49 +152,61 @@ async def parse_channels(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await update.message.reply_text("Запускаю парсинг, это займёт ~1-2 минуты...")
 
     all_results: List[Dict] = []
-    people_count = 0
-    projects_count = 0
+    people_batch: List[Dict] = []
+    projects_batch: List[Dict] = []
 
-    for channel in channels:
+    parsed = await parser.parse_channels_concurrently(
+        channels,
+        limit=parser_config.get("limit", 300),
+        max_concurrency=parser_config.get("parallel", DEFAULT_PARSE_CONCURRENCY),
+    )
+    for channel, results, _ in parsed:
         try:
-            results = await parser.parse_channel(channel, limit=parser_config.get("limit", 300))
-            for item in results:
-                enriched = classifier.enrich_data(item)
+            for enriched in classifier.enrich_batch(results):
                 all_results.append(enriched)
                 if enriched.get("type") == "project":
-                    database.add_project(enriched)
-                    projects_count += 1
+                    projects_batch.append(enriched)
                 else:
-                    database.add_person(enriched)
-                    people_count += 1
+                    people_batch.append(enriched)
         except Exception as e:
             logger.error(f"Ошибка при парсинге {channel}: {e}")
 
+    saved = True
+    try:
+        database.add_projects_bulk(projects_batch)
+        database.add_people_bulk(people_batch)
+    except Exception as e:
+        saved = False
+        logger.error(f"Ошибка при сохранении результатов парсинга: {e}")
+    invalidate_query_cache(context.application)
+
     summary = (
         f"Парсинг завершён.\n"
         f"Каналов: {len(channels)}\n"
         f"Найдено записей: {len(all_results)}\n"
-        f"Проекты: {projects_count}\n"
-        f"Люди: {people_count}"
+        f"Проекты: {len(projects_batch)}\n"
+        f"Люди: {len(people_batch)}"
     )
+    if not saved:
+        summary += "\nНе удалось сохранить результаты в базу, подробности в логе."
     await update.message.reply_text(summary)
 
     if all_results:
-        filename = f"vc_export_{update.effective_user.id}.xlsx"
-        parser.save_to_excel(all_results, filename)
-        with open(filename, "rb") as f:
-            await update.message.reply_document(
-                document=f,
-                filename="vc_data.xlsx",
-                caption="Актуальная выгрузка по парсингу",
-            )
-        os.remove(filename)
+        buffer = io.BytesIO()
+        # Сборка xlsx идёт в потоке, чтобы бот продолжал отвечать другим чатам
+        await asyncio.get_running_loop().run_in_executor(None, parser.save_to_excel, all_results, buffer)
+        buffer.seek(0)
+        await update.message.reply_document(
+            document=buffer,
+            filename="vc_data.xlsx",
+            caption="Актуальная выгрузка по парсингу",
+        )
 
 
 async def stats(update: Update, context: ContextTypes.DEFAULT_TYPE):
     services = await ensure_services(context.application)
     database: VCDatabase = services["database"]
-    data = database.get_statistics()
+    data = cached_query(context.application, "stats", database.get_statistics)
 
     message = (
         "Статистика по базе:\n"
@@ -208,7 +246,11 @@ async def show_people(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def show_projects(update: Update, context: ContextTypes.DEFAULT_TYPE):
     services = await ensure_services(context.application)
     database: VCDatabase = services["database"]
-    projects = database.get_projects(limit=10)
+    projects = cached_query(
+        context.application,
+        ("projects", 10),
+        lambda: database.get_projects(limit=10, columns=PROJECT_LIST_COLUMNS),
+    )
 
     if not projects:
         await update.message.reply_text("Проектов пока нет. Запустите /parse.")
@@ -234,20 +276,20 @@ async def export_data(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     await update.message.reply_text("Готовлю Excel...")
-    filename = f"vc_export_full_{update.effective_user.id}.xlsx"
-    with pd.ExcelWriter(filename, engine="openpyxl") as writer:
-        if people:
-            pd.DataFrame(people).to_excel(writer, sheet_name="Люди", index=False)
-        if projects:
-            pd.DataFrame(projects).to_excel(writer, sheet_name="Проекты", index=False)
-
-    with open(filename, "rb") as f:
-        await update.message.reply_document(
-            document=f,
-            filename="vc_export.xlsx",
-            caption="Выгрузка базы",
-        )
-    os.remove(filename)
+    sheets = {}
+    if people:
+        sheets["Люди"] = people
+    if projects:
+        sheets["Проекты"] = projects
+    buffer = io.BytesIO()
+    await asyncio.get_running_loop().run_in_executor(None, write_records_xlsx, buffer, sheets)
+    buffer.seek(0)
+
+    await update.message.reply_document(
+        document=buffer,
+        filename="vc_export.xlsx",
+        caption="Выгрузка базы",
+    )
 
 
 async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -258,7 +300,11 @@ async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     database: VCDatabase = services["database"]
 
     classification = None if query.data == "people_all" else query.data.replace("people_", "")
-    people = database.get_people(classification=classification, limit=20)
+    people = cached_query(
+        context.application,
+        ("people", classification, 20),
+        lambda: database.get_people(classification=classification, limit=20, columns=PEOPLE_LIST_COLUMNS),
+    )
 
     if not people:
         await query.edit_message_text("Нет данных для выбранной категории.")
@@ -310,10 +356,24 @@ async def create_application(enable_scheduler: bool = True) -> Application:
 
 
 def main():
-    """Запуск в режиме polling (локально)."""
+    """Запуск: вебхук, если задан WEBHOOK_URL, иначе polling (локально)."""
     try:
         application = asyncio.run(create_application(enable_scheduler=True))
-        application.run_polling(allowed_updates=Update.ALL_TYPES, drop_pending_updates=True)
+        webhook_url = os.getenv("WEBHOOK_URL")
+        if webhook_url:
+            # Telegram сам присылает обновления, без цикла getUpdates.
+            url_path = application.bot.token
+            application.run_webhook(
+                listen="0.0.0.0",
+                port=int(os.getenv("PORT", "8443")),
+                url_path=url_path,
+                webhook_url=f"{webhook_url.rstrip('/')}/{url_path}",
+                secret_token=os.getenv("TELEGRAM_WEBHOOK_SECRET") or None,
+                allowed_updates=Update.ALL_TYPES,
+                drop_pending_updates=True,
+            )
+        else:
+            application.run_polling(allowed_updates=Update.ALL_TYPES, drop_pending_updates=True)
     except Exception as e:
         logger.error(f"Не удалось запустить бота: {e}")
 
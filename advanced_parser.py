@@ -5,17 +5,193 @@
 """
 
 import asyncio
-import json
 import os
 import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union
 
 import pandas as pd
 from telethon import TelegramClient
 from telethon.sessions import StringSession
 from telethon.tl.types import Message
 
+from config_cache import load_json_cached
+from keyword_matcher import KeywordMatcher
+from parser_common import EXTRACT_BATCH_SIZE, MIN_POOL_BATCH, write_records_xlsx
+
+# Ключевые слова для определения типов сообщений. Таблицы общие для всех
+# экземпляров и процессов пула, поэтому неизменяемые.
+PROJECT_KEYWORDS = frozenset((
+    "стартап", "startup", "раунд", "round", "seed", "pre-seed", "series a",
+    "series b", "series c", "raise", "funding", "valuation", "оценка",
+    "финансирование", "инвестиции", "привлек", "поднял", "закрыл раунд",
+    "венчурный раунд", "раунд a", "раунд b", "раунд c",
+))
+
+PERSON_KEYWORD_GROUPS = {
+    "investor": (
+        "инвестор", "investor", "vc", "венчурный", "фонд", "fund",
+        "gp", "lp", "венчурный партнер", "partner vc", "managing partner",
+        "venture capital", "investment director", "директор по инвестициям",
+    ),
+    "angel": (
+        "бизнес-ангел", "бизнес ангел", "angel investor", "business angel",
+        "private investor", "частный инвестор", "ангельский инвестор",
+    ),
+    "mentor": (
+        "ментор", "mentor", "advisor", "adviser", "трекер", "tracker",
+        "эксперт", "coach", "консультант", "наставник",
+    ),
+    "founder": (
+        "founder", "cofounder", "co-founder", "основатель", "сооснователь",
+        "ceo", "cpo", "cto", "coo", "founding team",
+    ),
+    "operator": (
+        "product manager", "продакт", "маркетолог", "growth", "bizdev",
+        "sales", "developer", "engineer", "designer", "операционный директор",
+        "руководитель направления", "lead", "head of", "team lead",
+    ),
+}
+
+# Порядок важен: проверяется первая подходящая стадия/ниша ("pre-seed" раньше "seed").
+ROUND_STAGES = {
+    "pre-seed": ("pre-seed", "pre seed", "пре-сид", "пресид", "preseed"),
+    "seed": ("seed", "сид", "раунд seed"),
+    "series a": ("series a", "раунд a", "серия a"),
+    "series b": ("series b", "раунд b", "серия b"),
+    "series c": ("series c", "раунд c", "серия c"),
+    "angel": ("angel", "ангельский", "ангельский раунд"),
+    "bridge": ("bridge", "мостовой", "bridge round"),
+}
+
+THEMES = {
+    "FinTech": ("fintech", "финтех", "платеж", "оплата"),
+    "EdTech": ("edtech", "образование", "ed tech"),
+    "HealthTech": ("healthtech", "здоров", "health"),
+    "AI/ML": ("ai", "искусственный интеллект", "machine learning", "ml"),
+    "SaaS": ("saas", "b2b", "subscription"),
+    "E-commerce": ("e-commerce", "маркетплейс", "commerce", "marketplace"),
+}
+
+POSITIONS = (
+    "ceo", "cpo", "cto", "coo", "founder", "co-founder", "partner",
+    "investment director", "managing partner", "analyst", "associate",
+    "principal", "venture partner", "product manager", "маркетолог",
+    "руководитель", "директор", "менеджер", "growth", "bizdev", "sales",
+)
+
+
+@lru_cache(maxsize=None)
+def _keyword_matcher() -> KeywordMatcher:
+    """
+    Все ключевые слова ищутся одним проходом: проектные помечены "project",
+    ролевые — названием роли. Собирается один раз на процесс.
+    """
+    return KeywordMatcher(
+        [(kw, "project") for kw in PROJECT_KEYWORDS]
+        + [(kw, role) for role, keywords in PERSON_KEYWORD_GROUPS.items() for kw in keywords]
+    )
+
+
+# Регулярные выражения компилируются один раз при импорте модуля,
+# чтобы не пересобирать их на каждое сообщение.
+_PROJECT_NAME_PATTERNS = [
+    re.compile(p, re.IGNORECASE)
+    for p in (
+        r"проект[:\s]+([А-ЯA-Z][А-Яа-яA-Za-z0-9\s\-]{2,40})",
+        r"стартап[:\s]+([А-ЯA-Z][А-Яа-яA-Za-z0-9\s\-]{2,40})",
+        r"company[:\s]+([A-Z][A-Za-z0-9\s\-]{2,40})",
+        r"([A-ZА-Я][A-Za-zА-Яа-я0-9\-\s]{3,40})\s+(поднял|привлек|закрыл раунд)",
+    )
+]
+_FUNDING_PATTERNS = [
+    re.compile(p, re.IGNORECASE)
+    for p in (
+        r"(\$[\d\s.,]+[kmbKMB]?)",
+        r"(\d[\d\s.,]+)\s*(млн|миллион|тыс|k|m|b|млрд)",
+        r"([\d\s.,]+)\s*(₽|руб|рублей|доллар|usd|eur|евро)",
+    )
+]
+_FOUNDER_RE = re.compile(
+    r"(?:основател[ья]|founder|co-founder)[:\s]+([A-Za-zА-Яа-яёЁ][A-Za-zА-Яа-яёЁ\s\-]{3,60})",
+    re.IGNORECASE,
+)
+_TEAM_PATTERNS = [
+    re.compile(p, re.IGNORECASE)
+    for p in (
+        r"команда[:\s]+([A-Za-zА-Яа-яёЁ,\s\-]{5,120})",
+        r"team[:\s]+([A-Za-zА-Яа-яёЁ,\s\-]{5,120})",
+    )
+]
+_INVESTORS_PATTERNS = [
+    re.compile(p, re.IGNORECASE)
+    for p in (
+        r"инвестор[ы]?:\s+([A-Za-zА-Яа-яёЁ,\s\-]{3,120})",
+        r"investor[s]?:\s+([A-Za-zА-Яа-яёЁ,\s\-]{3,120})",
+        r"участн[ик|ики]\s+раунд[а]?:\s+([A-Za-zА-Яа-яёЁ,\s\-]{3,120})",
+    )
+]
+_SENTENCE_SPLIT_RE = re.compile(r"[.!?]\s+")
+_ACHIEVEMENT_KEYWORDS = ("достиг", "выручка", "mrr", "arr", "клиентов", "юзер", "рост")
+_FOUNDER_STATUS_KEYWORDS = ("основател", "founder", "соосновател")
+_PERSON_NAME_RE = re.compile(r"[А-Я][а-яё]+\s+[А-Я][а-яё]+|[A-Z][a-z]+\s+[A-Z][a-z]+")
+# Ищется по исходному тексту: casefold() может менять длину строки ("ß" -> "ss"),
+# и позиции из casefold-текста сдвинули бы вырезаемый фрагмент.
+_POSITION_RE = re.compile("|".join(re.escape(pos) for pos in POSITIONS), re.IGNORECASE)
+_COMPANY_PATTERNS = [
+    re.compile(r"в\s+([A-ZА-Я][A-Za-zА-Яа-я0-9\-\s]{2,40})"),
+    re.compile(r"company[:\s]+([A-Z][A-Za-z0-9\-\s]{2,40})"),
+]
+_EMAIL_RE = re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
+_TELEGRAM_RE = re.compile(r"@[a-zA-Z0-9_]+|t\.me/[a-zA-Z0-9_]+")
+_SOCIAL_PATTERNS = {
+    platform: re.compile(pattern, re.IGNORECASE)
+    for platform, pattern in (
+        ("linkedin", r"linkedin\.com/[^\s]+"),
+        ("twitter", r"(?:twitter|x)\.com/[^\s]+"),
+        ("facebook", r"facebook\.com/[^\s]+"),
+        ("instagram", r"instagram\.com/[^\s]+"),
+        ("vk", r"vk\.com/[^\s]+"),
+        ("telegram", r"t\.me/[^\s]+|telegram\.me/[^\s]+"),
+    )
+}
+# Ссылки, почта, соцсети, @-хэндлы и телефоны находятся одним проходом по тексту.
+# Внутри найденных ссылок (они короткие) дополнительно ищутся соцсети,
+# t.me-контакты и почта.
+_LINK_TOKEN_RE = re.compile(
+    r"(?P<url>https?://[^\s]+|www\.[^\s]+)"
+    r"|(?P<email>[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})"
+    r"|(?P<social>(?i:(?:linkedin|twitter|x|facebook|instagram|vk)\.com|t\.me|telegram\.me)/[^\s]+)"
+    r"|(?P<telegram>@[a-zA-Z0-9_]+)"
+    r"|(?P<phone>[\+]?[0-9]{10,15})"
+)
+
+
+# Сколько каналов парсится одновременно. Паузы от FloodWait Telethon выдерживает сам.
+DEFAULT_PARSE_CONCURRENCY = 5
+
+# Ключи записей в том порядке, в каком они попадают в выгрузку.
+_COMMON_HEAD_FIELDS = ("date", "channel", "message_id", "message_url", "type")
+_COMMON_TAIL_FIELDS = ("contacts", "social_links", "links", "full_text", "description")
+PROJECT_FIELDS = _COMMON_HEAD_FIELDS + (
+    "project_name", "investment_stage", "funding_amount", "theme",
+    "founder", "team", "project_investors", "achievements",
+) + _COMMON_TAIL_FIELDS
+PERSON_FIELDS = _COMMON_HEAD_FIELDS + (
+    "person_name", "position", "company", "status", "classification",
+) + _COMMON_TAIL_FIELDS
+
+# Куда сохраняется новая StringSession, если её нет ни в конфиге, ни в окружении.
+SESSION_STRING_FILE = "telegram_session.txt"
+
+# (текст, дата, название канала, id сообщения, username канала)
+MessagePayload = Tuple[str, Optional[str], str, int, Optional[str]]
+# (поля сообщения, это проект, подсказка роли, текст в casefold)
+Candidate = Tuple[MessagePayload, bool, Optional[str], str]
+
 
 def load_config() -> Optional[Dict]:
     """
@@ -45,100 +221,54 @@ def load_config() -> Optional[Dict]:
         return config
 
     try:
-        with open("config.json", "r", encoding="utf-8") as f:
-            data = json.load(f)
-            if env_session:
-                data["session_string"] = env_session
-            return data
+        data = load_json_cached("config.json")
+        if env_session:
+            data["session_string"] = env_session
+        return data
     except FileNotFoundError:
         print("Не найден config.json и не заданы переменные окружения TELEGRAM_API_ID/HASH/PHONE")
         return None
 
 
-class AdvancedVCParser:
-    """
-    Парсер Telegram-каналов для данных о проектах и людях венчура.
-    """
-
-    def __init__(
-        self,
-        api_id: int,
-        api_hash: str,
-        phone: str,
-        session_string: Optional[str] = None,
-        session_file: str = "vc_parser_session",
-    ):
-        self.api_id = api_id
-        self.api_hash = api_hash
-        self.phone = phone
-        self.session_string = session_string
-        session = StringSession(session_string) if session_string else session_file
-        self.client = TelegramClient(session, api_id, api_hash)
-
-        # Ключевые слова для определения типов сообщений
-        self.project_keywords = [
-            "стартап", "startup", "раунд", "round", "seed", "pre-seed", "series a",
-            "series b", "series c", "raise", "funding", "valuation", "оценка",
-            "финансирование", "инвестиции", "привлек", "поднял", "закрыл раунд",
-            "венчурный раунд", "раунд a", "раунд b", "раунд c",
-        ]
-
-        self.person_keyword_groups = {
-            "investor": [
-                "инвестор", "investor", "vc", "венчурный", "фонд", "fund",
-                "gp", "lp", "венчурный партнер", "partner vc", "managing partner",
-                "venture capital", "investment director", "директор по инвестициям",
-            ],
-            "angel": [
-                "бизнес-ангел", "бизнес ангел", "angel investor", "business angel",
-                "private investor", "частный инвестор", "ангельский инвестор",
-            ],
-            "mentor": [
-                "ментор", "mentor", "advisor", "adviser", "трекер", "tracker",
-                "эксперт", "coach", "консультант", "наставник",
-            ],
-            "founder": [
-                "founder", "cofounder", "co-founder", "основатель", "сооснователь",
-                "ceo", "cpo", "cto", "coo", "founding team",
-            ],
-            "operator": [
-                "product manager", "продакт", "маркетолог", "growth", "bizdev",
-                "sales", "developer", "engineer", "designer", "операционный директор",
-                "руководитель направления", "lead", "head of", "team lead",
-            ],
-        }
-
-    async def connect(self):
-        """Устанавливает соединение с Telegram."""
-        await self.client.start(phone=self.phone)
-        print("Телеграм-клиент успешно запущен.")
-
-    async def parse_channel(self, channel_username: str, limit: int = 500) -> List[Dict]:
-        """Сканирует указанный канал и извлекает нужные сообщения."""
-        results: List[Dict] = []
-        try:
-            print(f"Парсим канал: {channel_username}")
-            messages = await self.client.get_messages(channel_username, limit=limit)
-            print(f"Получено сообщений: {len(messages)}")
-
-            for message in messages:
-                if not message.text:
-                    continue
-                text_lower = message.text.lower()
-                is_project = any(kw in text_lower for kw in self.project_keywords)
-                person_hint = self._detect_person_hint(text_lower)
+def _load_session_string() -> str:
+    """Строка сессии, сохранённая прошлым входом, или пустая строка."""
+    try:
+        with open(SESSION_STRING_FILE, "r", encoding="utf-8") as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return ""
+
+
+def _save_session_string(session_string: str) -> None:
+    """Пишет строку сессии в файл с правами 0600."""
+    fd = os.open(SESSION_STRING_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(session_string)
+    # Права из os.open применяются только к новому файлу
+    os.chmod(SESSION_STRING_FILE, 0o600)
+
+
+def _message_payload(message: Message) -> MessagePayload:
+    """Достаёт из сообщения Telethon только те поля, что нужны для извлечения."""
+    return (
+        message.text,
+        message.date.strftime("%Y-%m-%d %H:%M:%S") if message.date else None,
+        getattr(message.chat, "title", "Unknown"),
+        message.id,
+        getattr(message.chat, "username", None),
+    )
 
-                if not is_project and not person_hint:
-                    continue
 
-                parsed = self.extract_extended_info(message, is_project, person_hint)
-                if parsed:
-                    results.append(parsed)
+class VCMessageExtractor:
+    """
+    Извлечение данных о проектах и людях из текста сообщения.
+    Не зависит от Telegram-клиента и может работать в процессах пула.
+    """
 
-            print(f"Найдено релевантных записей: {len(results)}")
-        except Exception as e:
-            print(f"Ошибка парсинга канала {channel_username}: {e}")
-        return results
+    def __init__(self):
+        self.project_keywords = PROJECT_KEYWORDS
+        self.person_keyword_groups = PERSON_KEYWORD_GROUPS
+        self._keyword_matcher = _keyword_matcher()
 
     def extract_extended_info(
         self,
@@ -147,43 +277,52 @@ class AdvancedVCParser:
         person_hint: Optional[str],
     ) -> Optional[Dict]:
         """Формирует структуру данных по проекту или персоне."""
-        text = message.text
-        text_lower = text.lower()
-
-        data: Dict[str, Optional[str]] = {
-            "date": message.date.strftime("%Y-%m-%d %H:%M:%S") if message.date else None,
-            "channel": getattr(message.chat, "title", "Unknown"),
-            "message_id": message.id,
-            "message_url": f"https://t.me/{getattr(message.chat, 'username', '')}/{message.id}"
-            if getattr(message.chat, "username", None)
-            else None,
-        }
+        return self.extract_from_payload(_message_payload(message), is_project, person_hint)
+
+    def extract_from_payload(
+        self,
+        payload: MessagePayload,
+        is_project: bool,
+        person_hint: Optional[str],
+        text_lower: Optional[str] = None,
+    ) -> Optional[Dict]:
+        """
+        То же, что extract_extended_info, но по полям сообщения (их можно передать в другой процесс).
+        text_lower — уже приведённый через casefold текст, если он посчитан при фильтрации.
+        """
+        text, date, chat_title, message_id, chat_username = payload
+        if text_lower is None:
+            text_lower = text.casefold()
+
+        # Запись создаётся сразу со всеми ключами и заполняется на месте.
+        data: Dict[str, Optional[str]] = dict.fromkeys(PROJECT_FIELDS if is_project else PERSON_FIELDS)
+        data["date"] = date
+        data["channel"] = chat_title
+        data["message_id"] = message_id
+        data["message_url"] = f"https://t.me/{chat_username}/{message_id}" if chat_username else None
 
         if is_project:
             data["type"] = "project"
-            data.update(self._extract_project_info(text, text_lower))
+            self._fill_project_info(data, text, text_lower)
         else:
             data["type"] = "person"
-            data.update(self._extract_person_info(text, text_lower, person_hint))
+            self._fill_person_info(data, text, text_lower, person_hint)
 
-        data["contacts"] = self._extract_contacts(text)
-        data["social_links"] = self._extract_social_links(text)
-        data["links"] = self._extract_all_links(text)
-        data["full_text"] = text[:2000] if len(text) > 2000 else text
-        data["description"] = text[:500] if len(text) > 500 else text
+        data["contacts"], data["social_links"], data["links"] = self._extract_links_and_contacts(text)
+        data["full_text"] = text[:2000]
+        data["description"] = text[:500]
         return data
 
     def _detect_person_hint(self, text_lower: str) -> Optional[str]:
         """Определяет базовую роль человека по ключевым словам."""
-        scores = {}
-        for role, keywords in self.person_keyword_groups.items():
-            score = sum(1 for kw in keywords if kw in text_lower)
-            scores[role] = score
-        best_role = max(scores, key=scores.get)
-        return best_role if scores[best_role] > 0 else None
-
-    def _extract_project_info(self, text: str, text_lower: str) -> Dict:
-        info: Dict[str, Optional[str]] = {}
+        return self._best_role(self._keyword_matcher.count_tags(text_lower))
+
+    def _best_role(self, tag_counts: Counter) -> Optional[str]:
+        """Выбирает роль с наибольшим числом найденных ключевых слов (при равенстве — первую по порядку)."""
+        best_role = max(self.person_keyword_groups, key=lambda role: tag_counts[role])
+        return best_role if tag_counts[best_role] > 0 else None
+
+    def _fill_project_info(self, info: Dict, text: str, text_lower: str):
         info["project_name"] = self._extract_project_name(text)
         info["investment_stage"] = self._extract_round_stage(text_lower)
         info["funding_amount"] = self._extract_funding_amount(text)
@@ -191,157 +330,92 @@ class AdvancedVCParser:
         info["founder"] = self._extract_founder(text)
         info["team"] = self._extract_team(text)
         info["project_investors"] = self._extract_investors(text)
-        info["achievements"] = self._extract_achievements(text)
-        return info
+        info["achievements"] = self._extract_achievements(text, text_lower)
 
-    def _extract_person_info(self, text: str, text_lower: str, person_hint: Optional[str]) -> Dict:
-        info: Dict[str, Optional[str]] = {}
+    def _fill_person_info(self, info: Dict, text: str, text_lower: str, person_hint: Optional[str]):
         info["person_name"] = self._extract_person_name(text)
         info["position"] = self._extract_position(text)
         info["company"] = self._extract_company(text)
         info["status"] = self._extract_status(text_lower)
         info["classification"] = person_hint or self._classify_person(text_lower)
-        return info
 
     def _extract_project_name(self, text: str) -> Optional[str]:
-        patterns = [
-            r"проект[:\s]+([А-ЯA-Z][А-Яа-яA-Za-z0-9\s\-]{2,40})",
-            r"стартап[:\s]+([А-ЯA-Z][А-Яа-яA-Za-z0-9\s\-]{2,40})",
-            r"company[:\s]+([A-Z][A-Za-z0-9\s\-]{2,40})",
-            r"([A-ZА-Я][A-Za-zА-Яа-я0-9\-\s]{3,40})\s+(поднял|привлек|закрыл раунд)",
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _PROJECT_NAME_PATTERNS:
+            match = pattern.search(text)
             if match:
                 name = match.group(1).strip()
                 return name[:60]
         return None
 
     def _extract_round_stage(self, text_lower: str) -> Optional[str]:
-        stages = {
-            "pre-seed": ["pre-seed", "pre seed", "пре-сид", "пресид", "preseed"],
-            "seed": ["seed", "сид", "раунд seed"],
-            "series a": ["series a", "раунд a", "серия a"],
-            "series b": ["series b", "раунд b", "серия b"],
-            "series c": ["series c", "раунд c", "серия c"],
-            "angel": ["angel", "ангельский", "ангельский раунд"],
-            "bridge": ["bridge", "мостовой", "bridge round"],
-        }
-        for stage, keywords in stages.items():
+        for stage, keywords in ROUND_STAGES.items():
             if any(kw in text_lower for kw in keywords):
                 return stage
         return None
 
     def _extract_funding_amount(self, text: str) -> Optional[str]:
-        patterns = [
-            r"(\$[\d\s.,]+[kmbKMB]?)",
-            r"(\d[\d\s.,]+)\s*(млн|миллион|тыс|k|m|b|млрд)",
-            r"([\d\s.,]+)\s*(₽|руб|рублей|доллар|usd|eur|евро)",
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _FUNDING_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return match.group(0).strip()
         return None
 
     def _extract_theme(self, text_lower: str) -> Optional[str]:
-        themes = {
-            "FinTech": ["fintech", "финтех", "платеж", "оплата"],
-            "EdTech": ["edtech", "образование", "ed tech"],
-            "HealthTech": ["healthtech", "здоров", "health"],
-            "AI/ML": ["ai", "искусственный интеллект", "machine learning", "ml"],
-            "SaaS": ["saas", "b2b", "subscription"],
-            "E-commerce": ["e-commerce", "маркетплейс", "commerce", "marketplace"],
-        }
-        for theme, keywords in themes.items():
+        for theme, keywords in THEMES.items():
             if any(kw in text_lower for kw in keywords):
                 return theme
         return "other"
 
     def _extract_founder(self, text: str) -> Optional[str]:
-        patterns = [
-            r"(?:основател[ья]|founder|co-founder)[:\s]+([A-Za-zА-Яа-яёЁ][A-Za-zА-Яа-яёЁ\s\-]{3,60})",
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(1).strip()
+        match = _FOUNDER_RE.search(text)
+        if match:
+            return match.group(1).strip()
         return None
 
     def _extract_team(self, text: str) -> Optional[str]:
-        patterns = [
-            r"команда[:\s]+([A-Za-zА-Яа-яёЁ,\s\-]{5,120})",
-            r"team[:\s]+([A-Za-zА-Яа-яёЁ,\s\-]{5,120})",
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _TEAM_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return match.group(1).strip()[:200]
         return None
 
     def _extract_investors(self, text: str) -> Optional[str]:
-        patterns = [
-            r"инвестор[ы]?:\s+([A-Za-zА-Яа-яёЁ,\s\-]{3,120})",
-            r"investor[s]?:\s+([A-Za-zА-Яа-яёЁ,\s\-]{3,120})",
-            r"участн[ик|ики]\s+раунд[а]?:\s+([A-Za-zА-Яа-яёЁ,\s\-]{3,120})",
-        ]
         investors: List[str] = []
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            investors.extend(matches)
+        for pattern in _INVESTORS_PATTERNS:
+            investors.extend(pattern.findall(text))
         return ", ".join(investors[:5]) if investors else None
 
-    def _extract_achievements(self, text: str) -> Optional[str]:
-        keywords = ["достиг", "выручка", "mrr", "arr", "клиентов", "юзер", "рост"]
-        if not any(kw in text.lower() for kw in keywords):
+    def _extract_achievements(self, text: str, text_lower: str) -> Optional[str]:
+        if not any(kw in text_lower for kw in _ACHIEVEMENT_KEYWORDS):
             return None
-        sentences = re.split(r"[.!?]\s+", text)
+        sentences = _SENTENCE_SPLIT_RE.split(text)
         for sentence in sentences:
-            if any(kw in sentence.lower() for kw in keywords):
+            sentence_lower = sentence.casefold()
+            if any(kw in sentence_lower for kw in _ACHIEVEMENT_KEYWORDS):
                 return sentence.strip()[:200]
         return None
 
     def _extract_person_name(self, text: str) -> Optional[str]:
-        patterns = [
-            r"([А-Я][а-яё]+\s+[А-Я][а-яё]+)",
-            r"([A-Z][a-z]+\s+[A-Z][a-z]+)",
-        ]
-        for pattern in patterns:
-            matches = re.findall(pattern, text)
-            if matches:
-                return matches[0][:80]
-        return None
+        match = _PERSON_NAME_RE.search(text)
+        return match.group(0)[:80] if match else None
 
     def _extract_position(self, text: str) -> Optional[str]:
-        positions = [
-            "ceo", "cpo", "cto", "coo", "founder", "co-founder", "partner",
-            "investment director", "managing partner", "analyst", "associate",
-            "principal", "venture partner", "product manager", "маркетолог",
-            "руководитель", "директор", "менеджер", "growth", "bizdev", "sales",
-        ]
-        text_lower = text.lower()
-        for pos in positions:
-            if pos in text_lower:
-                idx = text_lower.find(pos)
-                start = max(0, idx - 25)
-                end = min(len(text), idx + len(pos) + 25)
-                context = text[start:end].strip()
-                return context[:120]
-        return None
+        match = _POSITION_RE.search(text)
+        if not match:
+            return None
+        start = max(0, match.start() - 25)
+        end = min(len(text), match.end() + 25)
+        return text[start:end].strip()[:120]
 
     def _extract_company(self, text: str) -> Optional[str]:
-        patterns = [
-            r"в\s+([A-ZА-Я][A-Za-zА-Яа-я0-9\-\s]{2,40})",
-            r"company[:\s]+([A-Z][A-Za-z0-9\-\s]{2,40})",
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, text)
+        for pattern in _COMPANY_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return match.group(1).strip()[:60]
         return None
 
     def _extract_status(self, text_lower: str) -> Optional[str]:
-        if any(kw in text_lower for kw in ["основател", "founder", "соосновател"]):
+        if any(kw in text_lower for kw in _FOUNDER_STATUS_KEYWORDS):
             return "founder"
         if "стартап" in text_lower or "startup" in text_lower:
             return "startup"
@@ -353,51 +427,194 @@ class AdvancedVCParser:
         role = self._detect_person_hint(text_lower)
         return role or "unknown"
 
-    def _extract_contacts(self, text: str) -> Optional[str]:
-        email_pattern = r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
-        phone_pattern = r"[\+]?[0-9]{10,15}"
-        telegram_pattern = r"@[a-zA-Z0-9_]+|t\.me/[a-zA-Z0-9_]+"
-        emails = re.findall(email_pattern, text)
-        phones = re.findall(phone_pattern, text)
-        telegrams = re.findall(telegram_pattern, text)
+    def _extract_links_and_contacts(self, text: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """Возвращает (контакты, соцсети, ссылки) за один проход по тексту."""
+        emails: List[str] = []
+        phones: List[str] = []
+        telegrams: List[str] = []
+        urls: List[str] = []
+        social: Dict[str, List[str]] = {platform: [] for platform in _SOCIAL_PATTERNS}
+
+        for match in _LINK_TOKEN_RE.finditer(text):
+            kind = match.lastgroup
+            token = match.group(0)
+            if kind == "email":
+                emails.append(token)
+            elif kind == "telegram":
+                telegrams.append(token)
+            elif kind == "phone":
+                phones.append(token)
+            else:
+                if kind == "url":
+                    urls.append(token)
+                    emails.extend(_EMAIL_RE.findall(token))
+                telegrams.extend(_TELEGRAM_RE.findall(token))
+                for platform, pattern in _SOCIAL_PATTERNS.items():
+                    social[platform].extend(pattern.findall(token))
+
         contacts = emails + phones + telegrams
-        return ", ".join(contacts[:5]) if contacts else None
-
-    def _extract_social_links(self, text: str) -> Optional[str]:
-        patterns = {
-            "linkedin": r"linkedin\.com/[^\s]+",
-            "twitter": r"(?:twitter|x)\.com/[^\s]+",
-            "facebook": r"facebook\.com/[^\s]+",
-            "instagram": r"instagram\.com/[^\s]+",
-            "vk": r"vk\.com/[^\s]+",
-            "telegram": r"t\.me/[^\s]+|telegram\.me/[^\s]+",
-        }
-        links: List[str] = []
-        for platform, pattern in patterns.items():
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            links.extend([f"{platform}:{m}" for m in matches[:2]])
-        return ", ".join(links) if links else None
+        social_links = [f"{platform}:{m}" for platform, matches in social.items() for m in matches[:2]]
+        return (
+            ", ".join(contacts[:5]) if contacts else None,
+            ", ".join(social_links) if social_links else None,
+            ", ".join(urls[:10]) if urls else None,
+        )
+
+
+_worker_extractor: Optional[VCMessageExtractor] = None
+
+
+def _extract_batch(batch: List[Candidate]) -> List[Optional[Dict]]:
+    """Обрабатывает пачку сообщений в процессе пула."""
+    global _worker_extractor
+    if _worker_extractor is None:
+        _worker_extractor = VCMessageExtractor()
+    return [_worker_extractor.extract_from_payload(*item) for item in batch]
+
+
+class AdvancedVCParser(VCMessageExtractor):
+    """
+    Парсер Telegram-каналов для данных о проектах и людях венчура.
+    """
+
+    def __init__(
+        self,
+        api_id: int,
+        api_hash: str,
+        phone: str,
+        session_string: Optional[str] = None,
+    ):
+        self.api_id = api_id
+        self.api_hash = api_hash
+        self.phone = phone
+        # Сессия живёт только в памяти: файловая SQLite-сессия Telethon
+        # делает commit на каждое обновление состояния.
+        self.session_string = (
+            session_string or os.getenv("TELEGRAM_SESSION_STRING") or _load_session_string()
+        )
+        self.client = TelegramClient(StringSession(self.session_string), api_id, api_hash)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_failed = False
+        super().__init__()
+
+    async def connect(self):
+        """Устанавливает соединение с Telegram."""
+        await self.client.start(phone=self.phone)
+        print("Телеграм-клиент успешно запущен.")
+        if not self.session_string:
+            self.session_string = self.client.session.save()
+            # Строка сессии — полный доступ к аккаунту: в консоль она не выводится.
+            _save_session_string(self.session_string)
+            print(f"Создана новая сессия и сохранена в {SESSION_STRING_FILE} (доступ только владельцу).")
+            print("Для хостинга перенесите её содержимое в TELEGRAM_SESSION_STRING.")
+
+    async def parse_channel(self, channel_username: str, limit: int = 500) -> List[Dict]:
+        """Сканирует указанный канал и извлекает нужные сообщения."""
+        results, _ = await self.parse_channel_since(channel_username, limit)
+        return results
+
+    async def parse_channel_since(
+        self, channel_username: str, limit: int = 500, min_id: int = 0
+    ) -> Tuple[List[Dict], int]:
+        """
+        Как parse_channel, но берёт только сообщения новее min_id.
+        Возвращает (записи, id самого нового полученного сообщения); id равен 0,
+        если новых сообщений нет или канал не удалось разобрать целиком.
+        """
+        results: List[Dict] = []
+        newest_id = 0
+        candidates: List[Candidate] = []
+        try:
+            print(f"Парсим канал: {channel_username}")
+            received = 0
+            async for message in self.client.iter_messages(channel_username, limit=limit, min_id=min_id):
+                if not received:
+                    # Сообщения идут от новых к старым: первое — самое новое
+                    newest_id = message.id
+                received += 1
+                if not message.text:
+                    continue
+                text_lower = message.text.casefold()
+                tag_counts = self._keyword_matcher.count_tags(text_lower)
+                if not tag_counts:
+                    continue
+                is_project = "project" in tag_counts
+                person_hint = self._best_role(tag_counts)
+
+                if not is_project and not person_hint:
+                    continue
 
-    def _extract_all_links(self, text: str) -> Optional[str]:
-        url_pattern = r"https?://[^\s]+|www\.[^\s]+"
-        links = re.findall(url_pattern, text)
-        return ", ".join(links[:10]) if links else None
+                candidates.append((_message_payload(message), is_project, person_hint, text_lower))
+
+            results = [parsed for parsed in await self._extract_candidates(candidates) if parsed]
+            print(f"Получено сообщений: {received}")
+            print(f"Найдено релевантных записей: {len(results)}")
+        except Exception as e:
+            print(f"Ошибка парсинга канала {channel_username}: {e}")
+            # Канал разобран не целиком — курсор сдвигать нельзя
+            newest_id = 0
+        return results, newest_id
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        """Создаёт пул процессов при первом обращении (на некоторых хостингах он недоступен)."""
+        if self._pool is None and not self._pool_failed:
+            try:
+                self._pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+            except (OSError, NotImplementedError) as e:
+                print(f"Пул процессов недоступен, извлекаем данные в основном процессе: {e}")
+                self._pool_failed = True
+        return self._pool
+
+    async def _extract_candidates(
+        self, candidates: List[Candidate]
+    ) -> List[Optional[Dict]]:
+        """Извлекает данные из отобранных сообщений, по возможности в пуле процессов."""
+        pool = self._get_pool() if len(candidates) >= MIN_POOL_BATCH else None
+        if pool is None:
+            return [self.extract_from_payload(*item) for item in candidates]
+
+        loop = asyncio.get_running_loop()
+        batches = [candidates[i:i + EXTRACT_BATCH_SIZE] for i in range(0, len(candidates), EXTRACT_BATCH_SIZE)]
+        extracted = await asyncio.gather(*(loop.run_in_executor(pool, _extract_batch, batch) for batch in batches))
+        return [item for batch in extracted for item in batch]
+
+    async def parse_channels_concurrently(
+        self,
+        channel_usernames: List[str],
+        limit: int = 500,
+        max_concurrency: int = DEFAULT_PARSE_CONCURRENCY,
+        min_ids: Optional[Dict[str, int]] = None,
+    ) -> List[Tuple[str, List[Dict], int]]:
+        """
+        Парсит каналы параллельно, не больше max_concurrency одновременно.
+        min_ids — для каждого канала id, после которого начинаются новые сообщения.
+        Возвращает (канал, записи, id самого нового сообщения) — см. parse_channel_since.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        min_ids = min_ids or {}
+
+        async def _one(channel: str) -> Tuple[str, List[Dict], int]:
+            async with semaphore:
+                results, newest_id = await self.parse_channel_since(channel, limit, min_ids.get(channel, 0))
+                return channel, results, newest_id
+
+        return await asyncio.gather(*(_one(channel) for channel in channel_usernames))
 
     async def parse_multiple_channels(self, channel_usernames: List[str], limit: int = 500) -> List[Dict]:
-        """Парсит несколько каналов подряд."""
+        """Парсит несколько каналов и объединяет результаты."""
         all_results: List[Dict] = []
-        for channel in channel_usernames:
-            results = await self.parse_channel(channel, limit)
+        for _, results, _ in await self.parse_channels_concurrently(channel_usernames, limit):
             all_results.extend(results)
-            await asyncio.sleep(2)
         return all_results
 
-    def save_to_excel(self, data: List[Dict], filename: str = "vc_data_advanced.xlsx"):
+    def save_to_excel(self, data: List[Dict], filename: Union[str, BinaryIO] = "vc_data_advanced.xlsx"):
+        """Сохраняет данные в xlsx: в файл по пути или в переданный буфер (например, io.BytesIO)."""
         if not data:
             print("Нет данных для сохранения.")
             return
-        pd.DataFrame(data).to_excel(filename, index=False, engine="openpyxl")
-        print(f"Файл сохранен: {filename}")
+        write_records_xlsx(filename, {"Sheet1": data})
+        if isinstance(filename, str):
+            print(f"Файл сохранен: {filename}")
 
     def save_to_csv(self, data: List[Dict], filename: str = "vc_data_advanced.csv"):
         if not data:
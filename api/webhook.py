@@ -5,34 +5,61 @@ ASGI-обработчик для Vercel. Принимает вебхуки от
 
 import asyncio
 import os
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Header, HTTPException, Request
+import orjson
+from fastapi import BackgroundTasks, FastAPI, Header, HTTPException, Request
+from fastapi.responses import ORJSONResponse
 from telegram import Update
 
 from advanced_bot import create_application, ensure_services
 
-app = FastAPI()
-
 WEBHOOK_SECRET = os.getenv("TELEGRAM_WEBHOOK_SECRET", "")
+# Обработка апдейта после ответа — только для долгоживущего сервера. На Vercel вызов
+# могут заморозить сразу после 200 OK, а Telegram такой апдейт уже не пришлёт повторно.
+WEBHOOK_BACKGROUND = os.getenv("WEBHOOK_BACKGROUND", "").lower() in ("1", "true", "yes")
 bot_application = None
+# Бот запоминается один раз при старте, чтобы не доставать его из приложения на каждом апдейте.
+bot = None
 bot_lock = asyncio.Lock()
 
 
 async def get_bot_application():
-    global bot_application
+    """Поднимает приложение бота и сервисы один раз на процесс."""
+    global bot_application, bot
     if bot_application:
         return bot_application
 
     async with bot_lock:
         if bot_application:
             return bot_application
-        bot_application = await create_application(enable_scheduler=False)
-        await bot_application.initialize()
-        await bot_application.start()
-        await ensure_services(bot_application)
+        application = await create_application(enable_scheduler=False)
+        await application.initialize()
+        await application.start()
+        await ensure_services(application)
+        bot = application.bot
+        bot_application = application
         return bot_application
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Быстрый путь: приложение поднимается при холодном старте. Если среда
+    запускает app без lifespan, его лениво поднимет первый вебхук.
+    """
+    await get_bot_application()
+    try:
+        yield
+    finally:
+        if bot_application:
+            await bot_application.stop()
+            await bot_application.shutdown()
+
+
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
+
+
 @app.get("/api/health")
 async def health():
     return {"status": "ok"}
@@ -41,13 +68,16 @@ async def health():
 @app.post("/api/webhook")
 async def telegram_webhook(
     request: Request,
+    background_tasks: BackgroundTasks,
     x_telegram_bot_api_secret_token: str = Header(None),
 ):
     if WEBHOOK_SECRET and x_telegram_bot_api_secret_token != WEBHOOK_SECRET:
         raise HTTPException(status_code=401, detail="Bad secret token")
-
-    payload = await request.json()
-    application = await get_bot_application()
-    update = Update.de_json(payload, application.bot)
-    await application.process_update(update)
+    payload = orjson.loads(await request.body())
+    application = bot_application or await get_bot_application()
+    update = Update.de_json(payload, bot)
+    if WEBHOOK_BACKGROUND:
+        background_tasks.add_task(application.process_update, update)
+    else:
+        await application.process_update(update)
     return {"ok": True}
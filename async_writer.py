@@ -0,0 +1,88 @@
+"""
+Фоновая запись файлов с результатами (Excel/CSV), чтобы сериализация
+pandas/openpyxl не блокировала цикл событий бота.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Callable, Dict, List, Optional, Union
+
+# Записи списком словарей или по столбцам (имя поля -> значения)
+Records = Union[List[Dict], Dict[str, List]]
+# Куда писать: путь к файлу или буфер в памяти
+Target = Union[str, BinaryIO]
+WriteFunc = Callable[[Records, Target], None]
+
+
+class QueueFullError(Exception):
+    """Задача вытеснена из переполненной очереди более новой"""
+
+
+class AsyncArtifactWriter:
+    """
+    Очередь задач на запись файлов и пул потоков, который их выполняет.
+    submit() возвращается, когда файл уже лежит на диске.
+    В очереди ждут не больше max_pending задач: при переполнении самая старая
+    вытесняется, и её submit() завершается с QueueFullError.
+    """
+
+    def __init__(self, write: WriteFunc, max_workers: int = 2, max_pending: int = 16):
+        self.write = write
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._queue: Optional[asyncio.Queue] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._workers: List[asyncio.Task] = []
+
+    def start(self):
+        """Запускает обработчиков очереди (вызывать из работающего цикла событий)"""
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="artifact-writer")
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.max_workers)]
+
+    async def submit(self, data: Records, filename: Target):
+        """Ставит файл (или буфер) в очередь на запись и ждёт, пока он будет записан"""
+        self.start()
+        done = asyncio.get_running_loop().create_future()
+        job = (data, filename, done)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self._drop_oldest()
+            self._queue.put_nowait(job)
+        await done
+
+    def _drop_oldest(self):
+        _, _, done = self._queue.get_nowait()
+        if not done.done():
+            done.set_exception(QueueFullError("Слишком много задач на запись"))
+
+    async def close(self):
+        """Дописывает всё из очереди и останавливает потоки"""
+        if self._queue is None:
+            return
+        for _ in self._workers:
+            await self._queue.put(None)
+        await asyncio.gather(*self._workers)
+        self._executor.shutdown(wait=True)
+        self._queue = None
+        self._executor = None
+        self._workers = []
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            if job is None:
+                return
+            data, filename, done = job
+            try:
+                await loop.run_in_executor(self._executor, self.write, data, filename)
+            except Exception as e:
+                if not done.done():
+                    done.set_exception(e)
+            else:
+                if not done.done():
+                    done.set_result(filename)
@@ -0,0 +1,90 @@
+"""
+Накопление записей перед записью в БД: вместо отдельной транзакции на каждую
+запись пачка уходит одним bulk-вставом по размеру или по таймеру.
+"""
+
+import asyncio
+import logging
+from typing import Any, List, Optional, Tuple
+
+from database import VCDatabase
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncBatcher:
+    """
+    Копит элементы и отдаёт их в process_batch пачками.
+    Пачка сбрасывается, когда набралось max_batch_size элементов или
+    с момента первого элемента прошло max_queue_time секунд.
+    """
+
+    def __init__(self, max_batch_size: int = 64, max_queue_time: float = 0.1):
+        self.max_batch_size = max_batch_size
+        self.max_queue_time = max_queue_time
+        self._items: List[Any] = []
+        self._timer: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        # Сколько элементов не удалось сохранить с прошлого вызова flush()
+        self._failed = 0
+
+    async def process_batch(self, items: List[Any]):
+        raise NotImplementedError
+
+    async def put(self, item: Any):
+        self._items.append(item)
+        if len(self._items) >= self.max_batch_size:
+            await self._flush_pending()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def flush(self) -> int:
+        """
+        Сбрасывает всё накопленное; после возврата пачка уже обработана.
+        Возвращает число элементов, которые не удалось сохранить с прошлого flush(),
+        включая пачки, ушедшие по размеру или таймеру.
+        """
+        await self._flush_pending()
+        failed, self._failed = self._failed, 0
+        return failed
+
+    async def _flush_pending(self):
+        timer, self._timer = self._timer, None
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+        async with self._lock:
+            items, self._items = self._items, []
+            if not items:
+                return
+            try:
+                await self.process_batch(items)
+            except Exception as e:
+                self._failed += len(items)
+                logger.error(f"Не удалось сохранить пачку из {len(items)} записей: {e}")
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.max_queue_time)
+        await self._flush_pending()
+
+
+class CompletionBatcher(AsyncBatcher):
+    """
+    Пишет итоги планового парсинга пачками. Элемент — итог одного канала:
+    (канал, сколько сообщений получено, размеченные записи, id самого нового сообщения).
+    Записи, строка истории и курсор канала сохраняются одной транзакцией,
+    поэтому курсор не может уйти вперёд несохранённых записей.
+    """
+
+    def __init__(self, database: VCDatabase, max_batch_size: int = 64, max_queue_time: float = 1.0):
+        super().__init__(max_batch_size=max_batch_size, max_queue_time=max_queue_time)
+        self.database = database
+
+    async def process_batch(self, items: List[Tuple[str, int, List[dict], int]]):
+        for channel, messages_parsed, records, newest_id in items:
+            projects = [item for item in records if item.get("type") == "project"]
+            people = [item for item in records if item.get("type") != "project"]
+            try:
+                self.database.store_parsed_channel(channel, messages_parsed, projects, people, newest_id)
+            except Exception as e:
+                # Откатился только этот канал; его курсор не сдвинут, и сообщения придут снова
+                logger.error(f"Не удалось сохранить итоги канала {channel}: {e}")
@@ -2,7 +2,11 @@
 Простая классификация ролей и проектов для венчурного парсера.
 """
 
-from typing import Dict, List
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from keyword_matcher import KeywordMatcher
 
 
 ROLE_LABELS = {
@@ -14,6 +18,24 @@ ROLE_LABELS = {
     "unknown": "Требует ручной оценки",
 }
 
+STAGE_BONUS = {
+    "pre-seed": 1,
+    "seed": 2,
+    "series a": 3,
+    "series b": 3.5,
+    "series c": 4,
+}
+
+PRIORITY_THEMES = frozenset({"AI/ML", "FinTech", "SaaS", "HealthTech"})
+
+KEYWORD_WEIGHTS = {"strong": 2.5, "medium": 1.0}
+
+
+@lru_cache(maxsize=None)
+def _keyword_matcher(kw_table: Tuple[Tuple[str, str, float], ...]) -> KeywordMatcher:
+    """Матчер компилируется один раз на набор слов и переиспользуется всеми экземплярами."""
+    return KeywordMatcher((kw, (group, weight)) for kw, group, weight in kw_table)
+
 
 class VCClassifier:
     """Добавляет разметку роли человека и приоритет проекта."""
@@ -48,28 +70,38 @@ class VCClassifier:
             "medium": ["product", "market", "company", "b2b", "b2c", "growth", "roadmap"],
         }
 
-    def _score_text(self, text: str, keywords: Dict[str, List[str]]) -> float:
-        score = 0.0
-        for kw in keywords.get("strong", []):
-            if kw in text:
-                score += 2.5
-        for kw in keywords.get("medium", []):
-            if kw in text:
-                score += 1.0
-        return score
-
-    def classify_person(self, data: Dict) -> Dict:
-        text = data.get("full_text", "").lower()
+        # Плоская таблица (слово, группа, вес) вместо вложенных словарей strong/medium.
+        groups = dict(self.person_keywords, project=self.project_keywords)
+        self._kw_table: Tuple[Tuple[str, str, float], ...] = tuple(
+            (kw, group, KEYWORD_WEIGHTS[strength])
+            for group, keywords in groups.items()
+            for strength, words in keywords.items()
+            for kw in words
+        )
+        # Один проход по тексту даёт баллы сразу по всем ролям и по проекту.
+        self._matcher = _keyword_matcher(self._kw_table)
+
+    def _score_groups(self, text: str) -> Counter:
+        """Баллы по каждой группе слов (роли и "project"); текст уже приведён к нижнему регистру."""
+        scores: Counter = Counter()
+        for group, weight in self._matcher.tags_in(text):
+            scores[group] += weight
+        return scores
+
+    def classify_person(self, data: Dict, text_lc: Optional[str] = None) -> Dict:
+        text = text_lc if text_lc is not None else self._full_text_lc(data)
         hints = [
             data.get("classification", ""),
             data.get("status", ""),
-            (data.get("position") or "").lower(),
+            data.get("position"),
         ]
-        hint_text = " ".join(filter(None, hints)).lower()
+        hint_text = " ".join(filter(None, hints)).casefold()
 
+        text_scores = self._score_groups(text)
+        hint_scores = self._score_groups(hint_text) if hint_text else Counter()
         scores = {}
-        for role, kw in self.person_keywords.items():
-            scores[role] = self._score_text(text, kw) + self._score_text(hint_text, kw) * 0.7
+        for role in self.person_keywords:
+            scores[role] = float(text_scores[role]) + hint_scores[role] * 0.7
 
         best_role = max(scores, key=scores.get)
         best_score = scores[best_role]
@@ -91,21 +123,15 @@ class VCClassifier:
             "debug_scores": scores,
         }
 
-    def classify_project(self, data: Dict) -> Dict:
-        text = data.get("full_text", "").lower()
+    def classify_project(self, data: Dict, text_lc: Optional[str] = None) -> Dict:
+        text = text_lc if text_lc is not None else self._full_text_lc(data)
         stage = data.get("investment_stage") or ""
         theme = data.get("theme") or ""
 
-        relevance = self._score_text(text, self.project_keywords)
-        stage_bonus = {
-            "pre-seed": 1,
-            "seed": 2,
-            "series a": 3,
-            "series b": 3.5,
-            "series c": 4,
-        }.get(stage.lower(), 0.5)
+        relevance = float(self._score_groups(text)["project"])
+        stage_bonus = STAGE_BONUS.get(stage.lower(), 0.5)
 
-        priority_theme = 1.5 if theme in ["AI/ML", "FinTech", "SaaS", "HealthTech"] else 1.0
+        priority_theme = 1.5 if theme in PRIORITY_THEMES else 1.0
         total = relevance + stage_bonus + priority_theme
 
         return {
@@ -123,17 +149,23 @@ class VCClassifier:
             return "На наблюдении: следить за обновлениями, уточнить метрики."
         return "Слабая релевантность: можно отложить."
 
-    def enrich_data(self, data: Dict) -> Dict:
+    def _full_text_lc(self, data: Dict) -> str:
+        return (data.get("full_text") or "").casefold()
+
+    def enrich_data(self, data: Dict, text_lc: Optional[str] = None) -> Dict:
+        """text_lc — full_text в нижнем регистре, если вызывающий уже его посчитал."""
         enriched = data.copy()
+        if text_lc is None:
+            text_lc = self._full_text_lc(data)
         if data.get("type") == "project":
-            classification = self.classify_project(data)
+            classification = self.classify_project(data, text_lc)
             enriched.update({
                 "project_relevance": classification["relevance_score"],
                 "is_promising": classification["is_promising"],
                 "recommendation": classification["recommendation"],
             })
         else:
-            classification = self.classify_person(data)
+            classification = self.classify_person(data, text_lc)
             enriched.update({
                 "person_classification": classification["primary_classification"],
                 "classification_confidence": classification["confidence"],
@@ -141,3 +173,7 @@ class VCClassifier:
             })
         return enriched
 
+    def enrich_batch(self, items: List[Dict]) -> List[Dict]:
+        """Размечает сразу все записи, полученные из одного канала."""
+        enrich = self.enrich_data
+        return [enrich(item) for item in items]
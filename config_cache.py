@@ -0,0 +1,31 @@
+"""
+Чтение JSON-конфигов с кэшем: файл перечитывается, только когда меняется его mtime.
+"""
+
+import json
+import os
+from typing import Dict, Tuple
+
+_CFG_CACHE: Dict[str, Tuple[float, Dict]] = {}
+
+
+def load_json_cached(path: str) -> Dict:
+    """
+    Возвращает содержимое JSON-файла. Пока mtime файла не изменился,
+    отдаётся копия уже разобранного словаря без чтения с диска.
+    Если файла нет, поднимается FileNotFoundError, как и у open().
+    """
+    key = os.path.abspath(path)
+    mtime = os.stat(key).st_mtime
+    cached = _CFG_CACHE.get(key)
+    if cached and cached[0] == mtime:
+        return dict(cached[1])
+    with open(key, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    _CFG_CACHE[key] = (mtime, data)
+    return dict(data)
+
+
+def clear_config_cache():
+    """Сбрасывает кэш (например, в тестах)"""
+    _CFG_CACHE.clear()
@@ -3,19 +3,159 @@
 """
 
 import sqlite3
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+PERSON_INSERT_SQL = """
+    INSERT OR IGNORE INTO people (
+        person_name, position, company, status, classification,
+        classification_confidence, secondary_roles, contacts, social_links,
+        description, full_text, channel, message_id, message_url, date_found
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+PROJECT_INSERT_SQL = """
+    INSERT OR IGNORE INTO projects (
+        project_name, investment_stage, funding_amount, theme,
+        founder, team, project_investors, achievements,
+        relevance_score, is_promising, recommendation,
+        links, contacts, description, full_text,
+        channel, message_id, message_url, date_found
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+PARSING_HISTORY_INSERT_SQL = """
+    INSERT INTO parsing_history (channel, messages_parsed, people_found, projects_found)
+    VALUES (?, ?, ?, ?)
+"""
+
+# Курсор канала только растёт: назад его не откатывает даже старый id.
+CURSOR_UPSERT_SQL = """
+    INSERT INTO channel_cursors (channel, last_message_id) VALUES (?, ?)
+    ON CONFLICT(channel) DO UPDATE SET
+        last_message_id = MAX(last_message_id, excluded.last_message_id),
+        date_updated = CURRENT_TIMESTAMP
+"""
+
+# Столбцы таблиц в порядке объявления; get_people/get_projects по умолчанию отдают их все.
+PEOPLE_COLUMNS = (
+    "id", "person_name", "position", "company", "status", "classification",
+    "classification_confidence", "secondary_roles", "contacts", "social_links",
+    "description", "full_text", "channel", "message_id", "message_url",
+    "date_found", "date_added", "is_active",
+)
+
+PROJECT_COLUMNS = (
+    "id", "project_name", "investment_stage", "funding_amount", "theme",
+    "founder", "team", "project_investors", "achievements",
+    "relevance_score", "is_promising", "recommendation",
+    "links", "contacts", "description", "full_text",
+    "channel", "message_id", "message_url",
+    "date_found", "date_added", "is_active",
+)
+
+# Применяются один раз при открытии соединения.
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+)
+
+
+def _select_columns(columns: Optional[Sequence[str]], allowed: Tuple[str, ...]) -> Tuple[str, ...]:
+    if columns is None:
+        return allowed
+    unknown = set(columns) - set(allowed)
+    if unknown:
+        raise ValueError(f"Неизвестные столбцы: {', '.join(sorted(unknown))}")
+    return tuple(columns)
+
+
+def _person_params(data: Dict) -> Tuple:
+    return (
+        data.get("person_name"),
+        data.get("position"),
+        data.get("company"),
+        data.get("status"),
+        data.get("person_classification", data.get("classification")),
+        data.get("classification_confidence", 0.0),
+        data.get("secondary_roles"),
+        data.get("contacts"),
+        data.get("social_links"),
+        data.get("description"),
+        data.get("full_text"),
+        data.get("channel"),
+        data.get("message_id"),
+        data.get("message_url"),
+        data.get("date"),
+    )
+
+
+def _project_params(data: Dict) -> Tuple:
+    return (
+        data.get("project_name"),
+        data.get("investment_stage"),
+        data.get("funding_amount"),
+        data.get("theme"),
+        data.get("founder"),
+        data.get("team"),
+        data.get("project_investors"),
+        data.get("achievements"),
+        data.get("project_relevance", 0.0),
+        int(data.get("is_promising", False)),
+        data.get("recommendation"),
+        data.get("links"),
+        data.get("contacts"),
+        data.get("description"),
+        data.get("full_text"),
+        data.get("channel"),
+        data.get("message_id"),
+        data.get("message_url"),
+        data.get("date"),
+    )
 
 
 class VCDatabase:
     def __init__(self, db_path: str = "vc_database.db"):
         self.db_path = db_path
+        self._conn: Optional[sqlite3.Connection] = None
         self.init_database()
 
+    def connect(self) -> sqlite3.Connection:
+        """Одно долгоживущее соединение на весь процесс вместо открытия файла на каждый запрос."""
+        if self._conn is None:
+            # Без неявных транзакций модуля sqlite3: одиночные запросы идут в autocommit,
+            # а составные операции открывают транзакцию сами через transaction().
+            conn = sqlite3.connect(self.db_path, isolation_level=None)
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """BEGIN IMMEDIATE ... COMMIT: блокировка на запись берётся сразу, откат при ошибке."""
+        conn = self.connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
     def init_database(self):
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self.transaction() as conn:
+            self._create_schema(conn.cursor())
 
+    def _create_schema(self, cursor: sqlite3.Cursor):
         cursor.execute(
             """
             CREATE TABLE IF NOT EXISTS people (
@@ -83,6 +223,17 @@ class VCDatabase:
         """
         )
 
+        # До какого сообщения каждый канал уже разобран (для iter_messages(min_id=...))
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS channel_cursors (
+                channel TEXT PRIMARY KEY,
+                last_message_id INTEGER NOT NULL,
+                date_updated TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        """
+        )
+
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_people_classification ON people(classification)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_people_date ON people(date_added)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_projects_stage ON projects(investment_stage)")
@@ -92,8 +243,10 @@ class VCDatabase:
         self._ensure_column(cursor, "people", "secondary_roles", "TEXT")
         self._ensure_column(cursor, "people", "classification_confidence", "REAL")
 
-        conn.commit()
-        conn.close()
+        # Одно сообщение канала хранится один раз: повторы отсекает уникальный индекс,
+        # а INSERT OR IGNORE их пропускает без отдельного SELECT.
+        for table in ("people", "projects"):
+            self._ensure_unique_message(cursor, table)
 
     def _ensure_column(self, cursor: sqlite3.Cursor, table: str, column: str, col_type: str):
         cursor.execute(f"PRAGMA table_info({table})")
@@ -101,113 +254,74 @@ class VCDatabase:
         if column not in cols:
             cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {col_type}")
 
-    def add_person(self, data: Dict) -> int:
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        if data.get("message_id"):
-            cursor.execute(
-                """SELECT id FROM people WHERE message_id = ? AND channel = ?""",
-                (data["message_id"], data.get("channel", "")),
+    def _ensure_unique_message(self, cursor: sqlite3.Cursor, table: str):
+        index = f"ux_{table}_msg"
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (index,))
+        if cursor.fetchone():
+            return
+        # В старых базах могли остаться дубли — оставляем самую раннюю запись.
+        cursor.execute(
+            f"""
+            DELETE FROM {table}
+            WHERE message_id IS NOT NULL AND channel IS NOT NULL AND id NOT IN (
+                SELECT MIN(id) FROM {table}
+                WHERE message_id IS NOT NULL AND channel IS NOT NULL
+                GROUP BY channel, message_id
             )
-            existing = cursor.fetchone()
-            if existing:
-                conn.close()
-                return existing[0]
-
+        """
+        )
         cursor.execute(
-            """
-            INSERT INTO people (
-                person_name, position, company, status, classification,
-                classification_confidence, secondary_roles, contacts, social_links,
-                description, full_text, channel, message_id, message_url, date_found
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-            (
-                data.get("person_name"),
-                data.get("position"),
-                data.get("company"),
-                data.get("status"),
-                data.get("person_classification", data.get("classification")),
-                data.get("classification_confidence", 0.0),
-                data.get("secondary_roles"),
-                data.get("contacts"),
-                data.get("social_links"),
-                data.get("description"),
-                data.get("full_text"),
-                data.get("channel"),
-                data.get("message_id"),
-                data.get("message_url"),
-                data.get("date"),
-            ),
+            f"CREATE UNIQUE INDEX IF NOT EXISTS {index} ON {table}(channel, message_id) "
+            "WHERE message_id IS NOT NULL"
         )
 
-        person_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        return person_id
+    def add_person(self, data: Dict) -> int:
+        return self._insert_one("people", PERSON_INSERT_SQL, _person_params(data), data)
 
     def add_project(self, data: Dict) -> int:
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        if data.get("message_id"):
-            cursor.execute(
-                """SELECT id FROM projects WHERE message_id = ? AND channel = ?""",
-                (data["message_id"], data.get("channel", "")),
+        return self._insert_one("projects", PROJECT_INSERT_SQL, _project_params(data), data)
+
+    def add_people_bulk(self, rows: List[Dict]) -> int:
+        """Добавляет пачку людей одной транзакцией. Возвращает число новых записей."""
+        return self._insert_bulk("people", PERSON_INSERT_SQL, _person_params, rows)
+
+    def add_projects_bulk(self, rows: List[Dict]) -> int:
+        """Добавляет пачку проектов одной транзакцией. Возвращает число новых записей."""
+        return self._insert_bulk("projects", PROJECT_INSERT_SQL, _project_params, rows)
+
+    def _insert_one(self, table: str, insert_sql: str, params: Tuple, data: Dict) -> int:
+        with self.transaction() as conn:
+            cursor = conn.execute(insert_sql, params)
+            if cursor.rowcount:
+                return cursor.lastrowid
+            # Запись уже была — возвращаем её id.
+            cursor = conn.execute(
+                f"SELECT id FROM {table} WHERE message_id = ? AND channel = ?",
+                (data["message_id"], data.get("channel")),
             )
-            existing = cursor.fetchone()
-            if existing:
-                conn.close()
-                return existing[0]
-
-        cursor.execute(
-            """
-            INSERT INTO projects (
-                project_name, investment_stage, funding_amount, theme,
-                founder, team, project_investors, achievements,
-                relevance_score, is_promising, recommendation,
-                links, contacts, description, full_text,
-                channel, message_id, message_url, date_found
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-            (
-                data.get("project_name"),
-                data.get("investment_stage"),
-                data.get("funding_amount"),
-                data.get("theme"),
-                data.get("founder"),
-                data.get("team"),
-                data.get("project_investors"),
-                data.get("achievements"),
-                data.get("project_relevance", 0.0),
-                int(data.get("is_promising", False)),
-                data.get("recommendation"),
-                data.get("links"),
-                data.get("contacts"),
-                data.get("description"),
-                data.get("full_text"),
-                data.get("channel"),
-                data.get("message_id"),
-                data.get("message_url"),
-                data.get("date"),
-            ),
-        )
-
-        project_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        return project_id
-
-    def get_people(self, classification: Optional[str] = None, limit: int = 100) -> List[Dict]:
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+            return cursor.fetchone()[0]
+
+    def _insert_bulk(self, table: str, insert_sql: str, params, rows: List[Dict]) -> int:
+        if not rows:
+            return 0
+        values = [params(data) for data in rows]
+        with self.transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(insert_sql, values)
+            return conn.total_changes - before
+
+    def get_people(
+        self, classification: Optional[str] = None, limit: int = 100, columns: Optional[Sequence[str]] = None
+    ) -> List[Dict]:
+        """columns — только нужные столбцы (например, для списка в чате), по умолчанию все."""
+        columns = _select_columns(columns, PEOPLE_COLUMNS)
+        select = ", ".join(columns)
+        cursor = self.connect().cursor()
 
         if classification:
             cursor.execute(
-                """
-                SELECT * FROM people
+                f"""
+                SELECT {select} FROM people
                 WHERE classification = ? AND is_active = 1
                 ORDER BY date_added DESC
                 LIMIT ?
@@ -216,8 +330,8 @@ class VCDatabase:
             )
         else:
             cursor.execute(
-                """
-                SELECT * FROM people
+                f"""
+                SELECT {select} FROM people
                 WHERE is_active = 1
                 ORDER BY date_added DESC
                 LIMIT ?
@@ -225,19 +339,20 @@ class VCDatabase:
                 (limit,),
             )
 
-        rows = cursor.fetchall()
-        conn.close()
-        return [dict(row) for row in rows]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
 
-    def get_projects(self, stage: Optional[str] = None, limit: int = 100) -> List[Dict]:
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+    def get_projects(
+        self, stage: Optional[str] = None, limit: int = 100, columns: Optional[Sequence[str]] = None
+    ) -> List[Dict]:
+        """columns — только нужные столбцы (например, для списка в чате), по умолчанию все."""
+        columns = _select_columns(columns, PROJECT_COLUMNS)
+        select = ", ".join(columns)
+        cursor = self.connect().cursor()
 
         if stage:
             cursor.execute(
-                """
-                SELECT * FROM projects
+                f"""
+                SELECT {select} FROM projects
                 WHERE investment_stage = ? AND is_active = 1
                 ORDER BY date_added DESC
                 LIMIT ?
@@ -246,8 +361,8 @@ class VCDatabase:
             )
         else:
             cursor.execute(
-                """
-                SELECT * FROM projects
+                f"""
+                SELECT {select} FROM projects
                 WHERE is_active = 1
                 ORDER BY date_added DESC
                 LIMIT ?
@@ -255,39 +370,34 @@ class VCDatabase:
                 (limit,),
             )
 
-        rows = cursor.fetchall()
-        conn.close()
-        return [dict(row) for row in rows]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
 
     def get_statistics(self) -> Dict:
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute('SELECT COUNT(*) FROM people WHERE is_active = 1')
-        total_people = cursor.fetchone()[0]
+        cursor = self.connect().cursor()
 
-        cursor.execute('SELECT COUNT(*) FROM people WHERE classification = "Ментор" AND is_active = 1')
-        mentors = cursor.fetchone()[0]
-
-        cursor.execute('SELECT COUNT(*) FROM people WHERE classification = "Инвестор" AND is_active = 1')
-        investors = cursor.fetchone()[0]
-
-        cursor.execute('SELECT COUNT(*) FROM people WHERE classification = "Бизнес-ангел" AND is_active = 1')
-        angels = cursor.fetchone()[0]
-
-        cursor.execute('SELECT COUNT(*) FROM people WHERE classification = "Основатель стартапа" AND is_active = 1')
-        founders = cursor.fetchone()[0]
-
-        cursor.execute('SELECT COUNT(*) FROM people WHERE classification = "Работник стартапа" AND is_active = 1')
-        operators = cursor.fetchone()[0]
-
-        cursor.execute('SELECT COUNT(*) FROM projects WHERE is_active = 1')
-        total_projects = cursor.fetchone()[0]
+        # Все счётчики по таблице считаются за один проход.
+        cursor.execute(
+            """
+            SELECT
+                COUNT(*),
+                COUNT(CASE WHEN classification = 'Ментор' THEN 1 END),
+                COUNT(CASE WHEN classification = 'Инвестор' THEN 1 END),
+                COUNT(CASE WHEN classification = 'Бизнес-ангел' THEN 1 END),
+                COUNT(CASE WHEN classification = 'Основатель стартапа' THEN 1 END),
+                COUNT(CASE WHEN classification = 'Работник стартапа' THEN 1 END)
+            FROM people WHERE is_active = 1
+        """
+        )
+        total_people, mentors, investors, angels, founders, operators = cursor.fetchone()
 
-        cursor.execute('SELECT COUNT(*) FROM projects WHERE is_promising = 1 AND is_active = 1')
-        promising_projects = cursor.fetchone()[0]
+        cursor.execute(
+            """
+            SELECT COUNT(*), COUNT(CASE WHEN is_promising = 1 THEN 1 END)
+            FROM projects WHERE is_active = 1
+        """
+        )
+        total_projects, promising_projects = cursor.fetchone()
 
-        conn.close()
         return {
             "total_people": total_people,
             "mentors": mentors,
@@ -300,14 +410,28 @@ class VCDatabase:
         }
 
     def add_parsing_history(self, channel: str, messages_parsed: int, people_found: int, projects_found: int):
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            INSERT INTO parsing_history (channel, messages_parsed, people_found, projects_found)
-            VALUES (?, ?, ?, ?)
-        """,
-            (channel, messages_parsed, people_found, projects_found),
-        )
-        conn.commit()
-        conn.close()
+        self.connect().execute(PARSING_HISTORY_INSERT_SQL, (channel, messages_parsed, people_found, projects_found))
+
+    def get_last_message_id(self, channel: str) -> int:
+        """id последнего разобранного сообщения канала, 0 — если канал ещё не парсился."""
+        row = self.connect().execute(
+            "SELECT last_message_id FROM channel_cursors WHERE channel = ?", (channel,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def store_parsed_channel(
+        self, channel: str, messages_parsed: int, projects: List[Dict], people: List[Dict], newest_message_id: int
+    ):
+        """
+        Записи канала, строка истории и курсор — одной транзакцией: при ошибке
+        откатывается всё, и курсор не уходит вперёд несохранённых сообщений.
+        newest_message_id = 0 — курсор не трогать.
+        """
+        with self.transaction() as conn:
+            if projects:
+                conn.executemany(PROJECT_INSERT_SQL, [_project_params(data) for data in projects])
+            if people:
+                conn.executemany(PERSON_INSERT_SQL, [_person_params(data) for data in people])
+            conn.execute(PARSING_HISTORY_INSERT_SQL, (channel, messages_parsed, len(people), len(projects)))
+            if newest_message_id:
+                conn.execute(CURSOR_UPSERT_SQL, (channel, newest_message_id))
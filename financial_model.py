@@ -6,7 +6,7 @@ import pandas as pd
 import numpy as np
 
 # Base assumptions (values in billion RUB where appropriate)
-assumptions = {
+ASSUMPTIONS = {
     "customers_m": 37.0,  # Alfa customers, million (source)
     "retail_portfolio_trln": 8.9,  # trillion RUB (retail loan portfolio end-2024)
     "unsecured_share": 0.58,  # share of retail portfolio that is consumer/unsecured
@@ -36,191 +36,259 @@ assumptions = {
     "discount_rate": 0.15
 }
 
-# Derived base numbers
-unsecured_portfolio = assumptions["retail_portfolio_trln"] * 1000 * assumptions["unsecured_share"]  # in billion RUB
-bnpl_gmv_rub = assumptions["bnpl_gmv_usd_2025"] * assumptions["usd_rub"]  # in billion RUB
+YEARS = [2025, 2026, 2027]
+
+# Sensitivity: optimistic/pessimistic for subscription adoption and bnpl share
+SCENARIOS = [("pessimistic", [0.002, 0.01, 0.02], [0.01, 0.03, 0.06]),
+             ("optimistic", [0.01, 0.04, 0.09], [0.03, 0.08, 0.15])]
+
+OUTPUT_FILE = "alfa_bank_initiatives_projection.xlsx"
+
+
+def derive_base(assumptions=ASSUMPTIONS):
+    """Derived base numbers and the parts of the projection that do not depend on the adoption scenario."""
+    unsecured_portfolio = assumptions["retail_portfolio_trln"] * 1000 * assumptions["unsecured_share"]  # in billion RUB
+    # Credit-loss savings base (reduced provisions), the same every year
+    baseline_provisions = unsecured_portfolio * assumptions["credit_cost_of_risk"] / 1e3  # bn RUB (portfolio in bn)
+    n_years = len(assumptions["capex"])
+    return {
+        "unsecured_portfolio": unsecured_portfolio,
+        "bnpl_gmv_rub": assumptions["bnpl_gmv_usd_2025"] * assumptions["usd_rub"],  # in billion RUB
+        "baseline_provisions": baseline_provisions,
+        # Credit-loss savings (reduced provisions), bn RUB saved
+        "cr_savings": baseline_provisions * np.asarray(assumptions["cr_savings_factor"], dtype=float),
+        # Marketplace revenue, bn RUB (GMV already in bn RUB)
+        "mp_revenue": np.asarray(assumptions["mp_gmv_rub"], dtype=float) * assumptions["mp_commission"],
+        "opex": np.asarray(assumptions["opex"], dtype=float),
+        "capex": np.asarray(assumptions["capex"], dtype=float),
+        "discount_factors": (1 + assumptions["discount_rate"]) ** np.arange(1, n_years + 1),
+    }
 
-# Year-by-year projection (3 years)
-years = [2025, 2026, 2027]
-rows = []
 
-for i, y in enumerate(years):
+def project(sub_take_rate, bnpl_share, assumptions=ASSUMPTIONS, base=None):
+    """Projection arrays for the given adoption paths.
+
+    sub_take_rate and bnpl_share have years as the last axis; a 2-D input
+    (scenario x year) projects every scenario at once.
+    """
+    if base is None:
+        base = derive_base(assumptions)
+    sub_take_rate = np.asarray(sub_take_rate, dtype=float)
+    bnpl_share = np.asarray(bnpl_share, dtype=float)
+
     # Subscription revenue
-    subs = assumptions["customers_m"] * 1e6 * assumptions["sub_take_rate"][i]  # number of subscribers
+    subs = assumptions["customers_m"] * 1e6 * sub_take_rate  # number of subscribers
     sub_revenue = subs * (assumptions["sub_monthly_rub"] * 12) / 1e9  # in billion RUB (annual)
-    
+
     # BNPL revenue (merchant fee on captured GMV)
-    bnpl_revenue = bnpl_gmv_rub * assumptions["bnpl_share"][i] * assumptions["bnpl_merchant_fee"] / 1e9  # bn RUB
-    
-    # Marketplace revenue
-    mp_revenue = assumptions["mp_gmv_rub"][i] * assumptions["mp_commission"]  # bn RUB (already in bn RUB)
-    
-    # Credit-loss savings (reduced provisions)
-    baseline_provisions = unsecured_portfolio * assumptions["credit_cost_of_risk"] / 1e3  # bn RUB (portfolio in bn)
-    cr_savings = baseline_provisions * assumptions["cr_savings_factor"][i]  # bn RUB saved
-    
+    bnpl_revenue = base["bnpl_gmv_rub"] * bnpl_share * assumptions["bnpl_merchant_fee"] / 1e9  # bn RUB
+
     # Total revenue (commissions + realized provisioning savings)
-    total_revenue = sub_revenue + bnpl_revenue + mp_revenue
-    
+    total_revenue = sub_revenue + bnpl_revenue + base["mp_revenue"]
+
     # Cashflow before tax, before capex
-    ebitda_like = total_revenue + cr_savings - assumptions["opex"][i]
-    
+    ebitda_like = total_revenue + base["cr_savings"] - base["opex"]
+
     # Free cash flow (simplified): ebitda_like - capex (and apply tax to positive ebitda_like)
-    tax = 0 if ebitda_like <= 0 else ebitda_like * assumptions["tax_rate"]
-    fcff = ebitda_like - tax - assumptions["capex"][i]
-    
-    rows.append({
-        "year": y,
-        "subscribers_k": round(subs/1e3, 1),
-        "sub_revenue_bn": round(sub_revenue, 3),
-        "bnpl_revenue_bn": round(bnpl_revenue, 3),
-        "mp_revenue_bn": round(mp_revenue, 3),
-        "total_commission_revenue_bn": round(total_revenue, 3),
-        "baseline_provisions_bn": round(baseline_provisions, 3),
-        "cr_savings_bn": round(cr_savings, 3),
-        "opex_bn": round(assumptions["opex"][i], 3),
-        "capex_bn": round(assumptions["capex"][i], 3),
-        "ebitda_like_bn": round(ebitda_like, 3),
-        "tax_bn": round(tax, 3),
-        "fcff_bn": round(fcff, 3)
-    })
+    tax = np.where(ebitda_like <= 0, 0.0, ebitda_like * assumptions["tax_rate"])
+    fcff = ebitda_like - tax - base["capex"]
 
-df = pd.DataFrame(rows)
+    return {
+        "subs": subs,
+        "sub_revenue": sub_revenue,
+        "bnpl_revenue": bnpl_revenue,
+        "total_revenue": total_revenue,
+        "ebitda_like": ebitda_like,
+        "tax": tax,
+        "fcff": fcff,
+    }
 
-# NPV and IRR of the projected 3-year cashflows (using discount rate)
-cashflows = df["fcff_bn"].values.tolist()
-# Add initial capex as negative up-front cashflow in year0 if desired. Here capex included in year1.
-discount_rate = assumptions["discount_rate"]
-npv = sum([cashflows[i] / ((1+discount_rate)**(i+1)) for i in range(len(cashflows))])
 
-# IRR calculation using Newton-Raphson method
-def irr(cfs, guess=0.1, max_iter=100, tol=1e-6):
-    """Calculate Internal Rate of Return using Newton-Raphson method"""
-    def npv_func(rate):
-        return sum([cfs[i] / ((1 + rate) ** (i + 1)) for i in range(len(cfs))])
-    
-    def npv_derivative(rate):
-        return sum([-cfs[i] * (i + 1) / ((1 + rate) ** (i + 2)) for i in range(len(cfs))])
-    
-    try:
-        rate = guess
-        for _ in range(max_iter):
-            npv = npv_func(rate)
-            if abs(npv) < tol:
-                # Validate: IRR should be reasonable (between -1 and 10, for example)
-                if -1 < rate < 10:
-                    return rate
-                else:
-                    return None
-            
-            derivative = npv_derivative(rate)
-            if abs(derivative) < tol:
-                break
-            
-            rate = rate - npv / derivative
-            # Keep rate in reasonable bounds
-            if rate < -0.99 or rate > 10:
-                return None
-        
-        # Final check
-        if abs(npv_func(rate)) < tol and -1 < rate < 10:
-            return rate
-        return None
-    except:
+# IRR calculation from the roots of the NPV polynomial
+def _pick_irr(roots, guess):
+    """Turn polynomial roots x = 1 / (1 + rate) into the IRR closest to `guess`."""
+    real = roots[np.isclose(roots.imag, 0.0)].real
+    x = real[real > 0]
+    rates = 1.0 / x - 1.0
+    # Keep IRR in reasonable bounds
+    rates = rates[(rates > -1) & (rates < 10)]
+    if rates.size == 0:
         return None
+    return float(rates[np.argmin(np.abs(rates - guess))])
 
-irr_val = irr(cashflows)
 
-# Sensitivity: optimistic/pessimistic for subscription adoption and bnpl share
-sens = []
-for scenario in [("pessimistic", [0.002, 0.01, 0.02], [0.01, 0.03, 0.06]), 
-                 ("optimistic", [0.01, 0.04, 0.09], [0.03, 0.08, 0.15])]:
-    name, sub_rates, bnpl_shares = scenario
-    rows_s = []
-    for i in range(3):
-        subs_s = assumptions["customers_m"] * 1e6 * sub_rates[i]
-        sub_rev_s = subs_s * (assumptions["sub_monthly_rub"] * 12) / 1e9
-        bnpl_rev_s = bnpl_gmv_rub * bnpl_shares[i] * assumptions["bnpl_merchant_fee"] / 1e9
-        mp_rev_s = assumptions["mp_gmv_rub"][i] * assumptions["mp_commission"]
-        total_rev_s = sub_rev_s + bnpl_rev_s + mp_rev_s
-        baseline_provisions_s = baseline_provisions
-        cr_savings_s = baseline_provisions_s * assumptions["cr_savings_factor"][i]
-        ebitda_like_s = total_rev_s + cr_savings_s - assumptions["opex"][i]
-        tax_s = 0 if ebitda_like_s <= 0 else ebitda_like_s * assumptions["tax_rate"]
-        fcff_s = ebitda_like_s - tax_s - assumptions["capex"][i]
-        rows_s.append(fcff_s)
-    
-    npv_s = sum([rows_s[i] / ((1+discount_rate)**(i+1)) for i in range(3)])
-    irr_s = irr(rows_s)
-    sens.append({
-        "scenario": name, 
-        "npv_bn": round(npv_s, 3), 
-        "irr": round(irr_s, 3) if irr_s is not None else None
+def irr_batch(cashflows_2d, guess=0.1):
+    """IRR for every row of a scenario x year cashflow array.
+
+    With x = 1 / (1 + rate), NPV = sum(cfs[i] * x**(i + 1)) is a polynomial in x.
+    The companion matrices of all rows are stacked and solved with a single
+    np.linalg.eigvals call, so large scenario grids need no per-scenario
+    iterative search. When several rates qualify, the one closest to `guess`
+    is taken; None if a row has no real rate in (-1, 10).
+    """
+    cfs = np.atleast_2d(np.asarray(cashflows_2d, dtype=float))
+    n_scenarios, n_years = cfs.shape
+    results = [None] * n_scenarios
+    if n_years < 2:
+        return results
+
+    coeffs = cfs[:, ::-1]  # highest power first: cfs[-1] * x**(n-1) + ... + cfs[0]
+    regular = coeffs[:, 0] != 0
+    if regular.any():
+        lead = coeffs[regular]
+        degree = n_years - 1
+        companion = np.zeros((len(lead), degree, degree))
+        companion[:, 1:, :-1] = np.eye(degree - 1)
+        companion[:, 0, :] = -lead[:, 1:] / lead[:, :1]
+        for row, roots in zip(np.flatnonzero(regular), np.linalg.eigvals(companion)):
+            results[row] = _pick_irr(roots, guess)
+
+    # Rows ending with a zero cashflow have a lower-degree polynomial
+    for row in np.flatnonzero(~regular):
+        if np.any(cfs[row]):
+            results[row] = _pick_irr(np.roots(coeffs[row]), guess)
+    return results
+
+
+def irr(cfs, guess=0.1):
+    """Calculate Internal Rate of Return of a single cashflow series"""
+    return irr_batch([cfs], guess)[0]
+
+
+def build_projection(assumptions=ASSUMPTIONS, years=YEARS):
+    """Year-by-year projection table, its NPV and IRR: (df, npv, irr or None)."""
+    base = derive_base(assumptions)
+    result = project(assumptions["sub_take_rate"], assumptions["bnpl_share"], assumptions, base)
+
+    df = pd.DataFrame({
+        "year": years,
+        "subscribers_k": np.round(result["subs"] / 1e3, 1),
+        "sub_revenue_bn": np.round(result["sub_revenue"], 3),
+        "bnpl_revenue_bn": np.round(result["bnpl_revenue"], 3),
+        "mp_revenue_bn": np.round(base["mp_revenue"], 3),
+        "total_commission_revenue_bn": np.round(result["total_revenue"], 3),
+        "baseline_provisions_bn": np.full(len(years), round(base["baseline_provisions"], 3)),
+        "cr_savings_bn": np.round(base["cr_savings"], 3),
+        "opex_bn": np.round(base["opex"], 3),
+        "capex_bn": np.round(base["capex"], 3),
+        "ebitda_like_bn": np.round(result["ebitda_like"], 3),
+        "tax_bn": np.round(result["tax"], 3),
+        "fcff_bn": np.round(result["fcff"], 3),
     })
 
-# Display results
-separator = "=" * 80
-print("\n" + separator)
-print("ALFA-BANK INITIATIVES FINANCIAL PROJECTION")
-print(separator)
-print("\nProjected Cashflows (3 years):")
-print(df.to_string(index=False))
-print("\n" + "-" * 80)
-npv_text = f"NPV (15% discount rate): {npv:.3f} billion RUB"
-print(npv_text)
-if irr_val is not None:
-    print(f"IRR: {irr_val:.3f} ({irr_val*100:.1f}%)")
-else:
-    print("IRR: Could not be calculated")
-print("\nSensitivity Analysis:")
-for s in sens:
-    scenario_name = s['scenario'].capitalize()
-    npv_val = s['npv_bn']
-    if s['irr'] is not None:
-        irr_pct = s['irr'] * 100
-        print(f"  {scenario_name}: NPV = {npv_val:.3f} bn RUB, IRR = {s['irr']:.3f} ({irr_pct:.1f}%)")
+    # NPV and IRR of the projected 3-year cashflows (using discount rate)
+    cashflows = df["fcff_bn"].to_numpy()
+    # Add initial capex as negative up-front cashflow in year0 if desired. Here capex included in year1.
+    npv = float(np.sum(cashflows / base["discount_factors"]))
+    return df, npv, irr(cashflows)
+
+
+def run_sensitivity(assumptions=ASSUMPTIONS, scenarios=SCENARIOS):
+    """NPV and IRR for every (name, sub_rates, bnpl_shares) scenario, projected as one scenario x year array."""
+    base = derive_base(assumptions)
+    fcff_s = project(
+        [sub_rates for _, sub_rates, _ in scenarios],
+        [bnpl_shares for _, _, bnpl_shares in scenarios],
+        assumptions,
+        base,
+    )["fcff"]
+    npv_s = np.sum(fcff_s / base["discount_factors"], axis=1)
+    irr_s_all = irr_batch(fcff_s)
+
+    sens = []
+    for (name, _, _), npv_row, irr_s in zip(scenarios, npv_s, irr_s_all):
+        sens.append({
+            "scenario": name,
+            "npv_bn": round(float(npv_row), 3),
+            "irr": round(irr_s, 3) if irr_s is not None else None
+        })
+    return sens
+
+
+def print_report(df, npv, irr_val, sens):
+    separator = "=" * 80
+    print("\n" + separator)
+    print("ALFA-BANK INITIATIVES FINANCIAL PROJECTION")
+    print(separator)
+    print("\nProjected Cashflows (3 years):")
+    print(df.to_string(index=False))
+    print("\n" + "-" * 80)
+    npv_text = f"NPV (15% discount rate): {npv:.3f} billion RUB"
+    print(npv_text)
+    if irr_val is not None:
+        print(f"IRR: {irr_val:.3f} ({irr_val*100:.1f}%)")
     else:
-        print(f"  {scenario_name}: NPV = {npv_val:.3f} bn RUB, IRR = N/A")
-print(separator)
+        print("IRR: Could not be calculated")
+    print("\nSensitivity Analysis:")
+    for s in sens:
+        scenario_name = s['scenario'].capitalize()
+        npv_val = s['npv_bn']
+        if s['irr'] is not None:
+            irr_pct = s['irr'] * 100
+            print(f"  {scenario_name}: NPV = {npv_val:.3f} bn RUB, IRR = {s['irr']:.3f} ({irr_pct:.1f}%)")
+        else:
+            print(f"  {scenario_name}: NPV = {npv_val:.3f} bn RUB, IRR = N/A")
+    print(separator)
 
-# Export to Excel
-output_file = "alfa_bank_initiatives_projection.xlsx"
-with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-    df.to_excel(writer, sheet_name='Projection', index=False)
-    
-    # Create summary sheet
-    summary_data = {
-        "Metric": [
-            "Unsecured Portfolio (bn RUB)",
-            "BNPL Market Size (bn RUB)",
-            "NPV (bn RUB)",
-            "IRR (%)",
-        ],
-        "Value": [
-            round(unsecured_portfolio/1e3, 3),
-            round(bnpl_gmv_rub/1e3, 3),
-            round(npv, 3),
-            round(irr_val*100, 2) if irr_val is not None else "N/A",
-        ]
+
+def export_to_excel(output_file, df, npv, irr_val, sens, assumptions=ASSUMPTIONS):
+    base = derive_base(assumptions)
+    with pd.ExcelWriter(output_file, engine='xlsxwriter') as writer:
+        df.to_excel(writer, sheet_name='Projection', index=False)
+
+        # Create summary sheet
+        summary_data = {
+            "Metric": [
+                "Unsecured Portfolio (bn RUB)",
+                "BNPL Market Size (bn RUB)",
+                "NPV (bn RUB)",
+                "IRR (%)",
+            ],
+            "Value": [
+                round(base["unsecured_portfolio"]/1e3, 3),
+                round(base["bnpl_gmv_rub"]/1e3, 3),
+                round(npv, 3),
+                round(irr_val*100, 2) if irr_val is not None else "N/A",
+            ]
+        }
+        summary_df = pd.DataFrame(summary_data)
+        summary_df.to_excel(writer, sheet_name='Summary', index=False)
+
+        # Sensitivity analysis sheet
+        sens_df = pd.DataFrame(sens)
+        sens_df.to_excel(writer, sheet_name='Sensitivity', index=False)
+
+
+def build_summary(npv, irr_val, sens, assumptions=ASSUMPTIONS):
+    """Summary dictionary for programmatic access"""
+    base = derive_base(assumptions)
+    return {
+        "assumptions": assumptions,
+        "unsecured_portfolio_bn": round(base["unsecured_portfolio"]/1e3, 3),
+        "bnpl_gmv_rub_bn": round(base["bnpl_gmv_rub"]/1e3, 3),
+        "npv_bn": round(npv, 3),
+        "irr": round(irr_val, 3) if irr_val is not None else None,
+        "sensitivity": sens
     }
-    summary_df = pd.DataFrame(summary_data)
-    summary_df.to_excel(writer, sheet_name='Summary', index=False)
-    
-    # Sensitivity analysis sheet
-    sens_df = pd.DataFrame(sens)
-    sens_df.to_excel(writer, sheet_name='Sensitivity', index=False)
-
-print(f"\nResults exported to {output_file}")
-
-# Return summary dictionary for programmatic access
-summary = {
-    "assumptions": assumptions,
-    "unsecured_portfolio_bn": round(unsecured_portfolio/1e3, 3),
-    "bnpl_gmv_rub_bn": round(bnpl_gmv_rub/1e3, 3),
-    "npv_bn": round(npv, 3),
-    "irr": round(irr_val, 3) if irr_val is not None else None,
-    "sensitivity": sens
-}
 
-# Return both summary and dataframe records
-print("\nSummary dictionary and dataframe records available for further processing.")
\ No newline at end of file
+
+def main(output_file=OUTPUT_FILE):
+    df, npv, irr_val = build_projection()
+    sens = run_sensitivity()
+
+    # Display results
+    print_report(df, npv, irr_val, sens)
+
+    # Export to Excel
+    export_to_excel(output_file, df, npv, irr_val, sens)
+    print(f"\nResults exported to {output_file}")
+
+    summary = build_summary(npv, irr_val, sens)
+
+    # Return both summary and dataframe records
+    print("\nSummary dictionary and dataframe records available for further processing.")
+    return summary, df
+
+
+if __name__ == "__main__":
+    main()
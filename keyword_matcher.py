@@ -0,0 +1,67 @@
+"""
+Поиск набора ключевых слов в тексте за один проход.
+Заменяет циклы вида any(kw in text for kw in keywords) по нескольким спискам.
+"""
+
+import re
+from collections import Counter
+from typing import Dict, Hashable, Iterable, List, Set, Tuple
+
+try:
+    import ahocorasick  # pyahocorasick, необязательная зависимость
+except ImportError:
+    ahocorasick = None
+
+
+class KeywordMatcher:
+    """
+    Находит все ключевые слова, которые встречаются в тексте как подстроки.
+    Каждому слову можно привязать одну или несколько меток (роль, категория).
+    """
+
+    def __init__(self, tagged_keywords: Iterable[Tuple[str, Hashable]]):
+        self.tags: Dict[str, List[Hashable]] = {}
+        for keyword, tag in tagged_keywords:
+            self.tags.setdefault(keyword, []).append(tag)
+
+        # Длинные слова идут первыми: в каждой позиции регулярка берёт самое
+        # длинное совпадение, а более короткие слова, которые в нём содержатся,
+        # добавляются по заранее посчитанной таблице.
+        keywords = sorted(self.tags, key=len, reverse=True)
+        self._contained = {kw: tuple(other for other in keywords if other in kw) for kw in keywords}
+        alternation = "|".join(re.escape(kw) for kw in keywords)
+        self._any_re = re.compile(alternation)
+        self._all_re = re.compile(f"(?=({alternation}))")
+
+        # Если установлен pyahocorasick, полный поиск идёт по автомату Ахо-Корасик.
+        self._automaton = None
+        if ahocorasick is not None and keywords:
+            automaton = ahocorasick.Automaton()
+            for kw in keywords:
+                automaton.add_word(kw, kw)
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def search(self, text: str) -> bool:
+        """Есть ли в тексте хотя бы одно ключевое слово (останавливается на первом)."""
+        if self._automaton is not None:
+            return next(self._automaton.iter(text), None) is not None
+        return self._any_re.search(text) is not None
+
+    def find(self, text: str) -> Set[str]:
+        """Множество всех ключевых слов, найденных в тексте."""
+        if self._automaton is not None:
+            return {kw for _, kw in self._automaton.iter(text)}
+        found: Set[str] = set()
+        for match in self._all_re.finditer(text):
+            found.update(self._contained[match.group(1)])
+        return found
+
+    def tags_in(self, text: str) -> List[Hashable]:
+        """Метки всех найденных слов (по одной на каждое слово и метку)."""
+        return [tag for keyword in self.find(text) for tag in self.tags[keyword]]
+
+    def count_tags(self, text: str) -> Counter:
+        """Сколько разных ключевых слов с каждой меткой найдено в тексте."""
+        tags = self.tags
+        return Counter(tag for keyword in self.find(text) for tag in tags[keyword])
@@ -0,0 +1,52 @@
+"""
+Общее для advanced_parser и telegram_parser: пороги пула извлечения
+и запись результатов в xlsx без промежуточного DataFrame.
+"""
+
+from typing import BinaryIO, Dict, List, Union
+
+import xlsxwriter
+
+# Извлечение данных уходит в пул процессов пачками; на малых объемах
+# накладные расходы на передачу данных дороже самой работы.
+EXTRACT_BATCH_SIZE = 64
+MIN_POOL_BATCH = 20
+
+
+def _open_xlsx(target: Union[str, BinaryIO]) -> xlsxwriter.Workbook:
+    # Тексты из каналов пишем как есть: без автоссылок и формул.
+    options = {"strings_to_urls": False, "strings_to_formulas": False}
+    if isinstance(target, str):
+        options["constant_memory"] = True
+    else:
+        options["in_memory"] = True
+    return xlsxwriter.Workbook(target, options)
+
+
+def write_records_xlsx(target: Union[str, BinaryIO], sheets: Dict[str, List[Dict]]) -> None:
+    """
+    Пишет списки словарей в xlsx напрямую, без промежуточного DataFrame.
+    Каждый ключ sheets — отдельный лист; заголовки — объединение ключей записей.
+    """
+    workbook = _open_xlsx(target)
+    try:
+        for sheet_name, rows in sheets.items():
+            worksheet = workbook.add_worksheet(sheet_name)
+            headers = list(dict.fromkeys(key for row in rows for key in row))
+            worksheet.write_row(0, 0, headers)
+            for row_idx, row in enumerate(rows, start=1):
+                worksheet.write_row(row_idx, 0, [row.get(header) for header in headers])
+    finally:
+        workbook.close()
+
+
+def write_columns_xlsx(target: Union[str, BinaryIO], columns: Dict[str, List], sheet_name: str = "Sheet1") -> None:
+    """Пишет таблицу, заданную по столбцам (заголовок -> значения), на один лист."""
+    workbook = _open_xlsx(target)
+    try:
+        worksheet = workbook.add_worksheet(sheet_name)
+        worksheet.write_row(0, 0, list(columns))
+        for row_idx, row in enumerate(zip(*columns.values()), start=1):
+            worksheet.write_row(row_idx, 0, row)
+    finally:
+        workbook.close()
@@ -7,18 +7,23 @@ import logging
 from datetime import datetime, timedelta
 from typing import Optional
 
-from advanced_parser import AdvancedVCParser, load_config
+from advanced_parser import DEFAULT_PARSE_CONCURRENCY, AdvancedVCParser, load_config
+from batcher import CompletionBatcher
 from classifier import VCClassifier
 from database import VCDatabase
 
 logger = logging.getLogger(__name__)
 
+# Пауза перед новой попыткой после сбоя в цикле планировщика
+RETRY_DELAY_SECONDS = 60
+
 
 class ParsingScheduler:
     def __init__(self, parser: AdvancedVCParser, classifier: VCClassifier, database: VCDatabase, enabled: bool = True):
         self.parser = parser
         self.classifier = classifier
         self.database = database
+        self.batcher = CompletionBatcher(database)
         self.enabled = enabled
         self.is_running = False
         self.last_parse_date: Optional[datetime] = None
@@ -35,19 +40,22 @@ class ParsingScheduler:
     async def _scheduler_loop(self):
         while self.is_running:
             try:
-                if self._should_parse():
-                    logger.info("Запускаем плановый парсинг каналов...")
-                    await self.run_parsing()
-                    self.last_parse_date = datetime.now()
-                await asyncio.sleep(3600)  # проверяем раз в час
+                # Спим ровно до следующего запуска, а не просыпаемся раз в час
+                await asyncio.sleep(self._seconds_until_next_parse())
+                if not self.is_running:
+                    break
+                logger.info("Запускаем плановый парсинг каналов...")
+                await self.run_parsing()
+                self.last_parse_date = datetime.now()
             except Exception as e:
                 logger.error(f"Сбой в планировщике: {e}")
-                await asyncio.sleep(3600)
+                await asyncio.sleep(RETRY_DELAY_SECONDS)
 
-    def _should_parse(self) -> bool:
+    def _seconds_until_next_parse(self) -> float:
         if self.last_parse_date is None:
-            return True
-        return (datetime.now() - self.last_parse_date) >= timedelta(days=self.parse_interval_days)
+            return 0.0
+        deadline = self.last_parse_date + timedelta(days=self.parse_interval_days)
+        return max(0.0, (deadline - datetime.now()).total_seconds())
 
     async def run_parsing(self):
         try:
@@ -61,29 +69,26 @@ class ParsingScheduler:
                 logger.warning("Нет каналов для парсинга.")
                 return
 
+            # Берём только сообщения новее уже разобранных в прошлых запусках.
+            min_ids = {channel: self.database.get_last_message_id(channel) for channel in channels}
+            parsed = await self.parser.parse_channels_concurrently(
+                channels,
+                limit=config.get("limit", 300),
+                max_concurrency=config.get("parallel", DEFAULT_PARSE_CONCURRENCY),
+                min_ids=min_ids,
+            )
+
             all_results = []
-            for channel in channels:
+            for channel, results, newest_id in parsed:
                 try:
-                    results = await self.parser.parse_channel(channel, limit=config.get("limit", 300))
-                    enriched_results = []
-                    people_count = 0
-                    projects_count = 0
-
-                    for result in results:
-                        enriched = self.classifier.enrich_data(result)
-                        enriched_results.append(enriched)
-                        if enriched.get("type") == "project":
-                            self.database.add_project(enriched)
-                            projects_count += 1
-                        else:
-                            self.database.add_person(enriched)
-                            people_count += 1
-
-                    self.database.add_parsing_history(channel, len(results), people_count, projects_count)
+                    enriched_results = self.classifier.enrich_batch(results)
+                    # Итоги каналов уходят в БД пачками; каждый канал — своей транзакцией.
+                    await self.batcher.put((channel, len(results), enriched_results, newest_id))
                     all_results.extend(enriched_results)
                     logger.info(f"{channel}: обработано {len(results)} сообщений.")
                 except Exception as e:
                     logger.error(f"Сбой при парсинге канала {channel}: {e}")
+            await self.batcher.flush()
 
             logger.info(f"Плановый парсинг завершен. Всего новых записей: {len(all_results)}")
         except Exception as e:
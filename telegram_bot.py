@@ -4,13 +4,16 @@ Telegram бот для парсинга венчурных каналов
 """
 
 import asyncio
-import json
+import io
 import logging
+from collections import Counter
 from typing import List, Dict
 from telegram import Update
 from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes
-from telegram_parser import TelegramVCParser, load_config
-import os
+from telegram_parser import DEFAULT_PARALLEL, TelegramVCParser, count_results, load_config
+from async_writer import AsyncArtifactWriter, QueueFullError
+from config_cache import load_json_cached
+from telegram_governor import TelegramGovernor
 
 # Настройка логирования
 logging.basicConfig(
@@ -23,16 +26,29 @@ logger = logging.getLogger(__name__)
 parser_instance = None
 bot_config = None
 parser_config = None  # Конфигурация парсера (с каналами)
+artifact_writer = None  # Фоновая запись Excel-файлов
+governor = TelegramGovernor()  # Общий темп всех ответов бота
 
 def load_bot_config():
     """Загружает конфигурацию бота"""
     try:
-        with open('bot_config.json', 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return load_json_cached('bot_config.json')
     except FileNotFoundError:
         logger.error("Файл bot_config.json не найден!")
         return None
 
+async def reply_text(update: Update, text: str, **kwargs):
+    """Отправляет ответ в чат с учётом лимитов Telegram"""
+    return await governor.call(update.message.reply_text, text, chat_id=update.effective_chat.id, **kwargs)
+
+async def edit_text(update: Update, message, text: str, **kwargs):
+    """Меняет текст уже отправленного статуса вместо нового сообщения"""
+    return await governor.call(message.edit_text, text, chat_id=update.effective_chat.id, **kwargs)
+
+async def reply_document(update: Update, **kwargs):
+    """Отправляет файл в чат (document — bytes, чтобы его можно было отправить повторно)"""
+    return await governor.call(update.message.reply_document, chat_id=update.effective_chat.id, **kwargs)
+
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Обработчик команды /start"""
     try:
@@ -55,12 +71,12 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 Начните с команды /parse для парсинга всех каналов из списка!
         """
-        await update.message.reply_text(welcome_message, parse_mode='HTML')
+        await reply_text(update, welcome_message, parse_mode='HTML')
         logger.info(f"Отправлено приветственное сообщение пользователю {update.effective_user.id}")
     except Exception as e:
         logger.error(f"Ошибка при обработке /start: {e}")
         try:
-            await update.message.reply_text("❌ Произошла ошибка. Попробуйте позже.")
+            await reply_text(update, "❌ Произошла ошибка. Попробуйте позже.")
         except:
             pass
 
@@ -89,85 +105,85 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 <b>Результаты:</b>
 После парсинга бот отправит вам файл Excel с найденными проектами и инвесторами.
     """
-    await update.message.reply_text(help_text, parse_mode='HTML')
+    await reply_text(update, help_text, parse_mode='HTML')
 
 async def parse_channels(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Парсит все каналы из конфигурации"""
-    global parser_instance, parser_config
+    global parser_instance, parser_config, artifact_writer
     
     if not parser_instance:
-        await update.message.reply_text("❌ Бот не инициализирован. Проверьте конфигурацию.")
+        await reply_text(update, "❌ Бот не инициализирован. Проверьте конфигурацию.")
         return
     
     if not parser_config:
-        await update.message.reply_text("❌ Конфигурация парсера не загружена.")
+        await reply_text(update, "❌ Конфигурация парсера не загружена.")
         return
     
-    await update.message.reply_text("🔍 Начинаю парсинг каналов... Это может занять несколько минут.")
+    # Один статус на запрос: дальше он редактируется, новым сообщением уходит только файл
+    status = await reply_text(update, "🔍 Начинаю парсинг каналов... Это может занять несколько минут.")
     
     try:
         channels = parser_config.get('channels', [])
         if not channels:
-            await update.message.reply_text("❌ В конфигурации не указаны каналы для парсинга.")
+            await edit_text(update, status, "❌ В конфигурации не указаны каналы для парсинга.")
             return
         
         # Парсим каналы
         results = await parser_instance.parse_multiple_channels(
             channels, 
-            limit=parser_config.get('limit', 100)
+            limit=parser_config.get('limit', 100),
+            max_concurrency=parser_config.get('parallel', DEFAULT_PARALLEL)
         )
         
-        if not results:
-            await update.message.reply_text("⚠️ Не найдено релевантных сообщений в указанных каналах.")
+        total = count_results(results)
+        if not total:
+            await edit_text(update, status, "⚠️ Не найдено релевантных сообщений в указанных каналах.")
             return
         
-        # Сохраняем результаты
-        filename = f'vc_projects_{update.message.chat_id}.xlsx'
-        parser_instance.save_to_excel(results, filename)
+        # Книга собирается в памяти в фоновом потоке, без временного файла на диске
+        buffer = io.BytesIO()
+        await artifact_writer.submit(results, buffer)
         
         # Отправляем статистику
-        projects = [r for r in results if r['type'] == 'Проект']
-        investors = [r for r in results if r['type'] == 'Инвестор']
+        type_counts = Counter(results['type'])
         
         stats_message = f"""
 ✅ <b>Парсинг завершен!</b>
 
 📊 <b>Статистика:</b>
-• Всего найдено записей: {len(results)}
-• Проектов: {len(projects)}
-• Инвесторов: {len(investors)}
+• Всего найдено записей: {total}
+• Проектов: {type_counts['Проект']}
+• Инвесторов: {type_counts['Инвестор']}
 • Каналов обработано: {len(channels)}
 
 📁 Файл с результатами готовится к отправке...
         """
-        await update.message.reply_text(stats_message, parse_mode='HTML')
+        await edit_text(update, status, stats_message, parse_mode='HTML')
         
         # Отправляем файл
-        with open(filename, 'rb') as file:
-            await update.message.reply_document(
-                document=file,
-                filename='vc_projects.xlsx',
-                caption='📊 Результаты парсинга венчурных каналов'
-            )
-        
-        # Удаляем временный файл
-        if os.path.exists(filename):
-            os.remove(filename)
+        await reply_document(
+            update,
+            document=buffer.getvalue(),
+            filename='vc_projects.xlsx',
+            caption='📊 Результаты парсинга венчурных каналов'
+        )
             
+    except QueueFullError:
+        await edit_text(update, status, "🕒 Слишком много задач, подождите")
     except Exception as e:
         logger.error(f"Ошибка при парсинге: {e}")
-        await update.message.reply_text(f"❌ Произошла ошибка: {str(e)}")
+        await edit_text(update, status, f"❌ Произошла ошибка: {str(e)}")
 
 async def parse_single_channel(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Парсит один указанный канал"""
-    global parser_instance, parser_config
+    global parser_instance, parser_config, artifact_writer
     
     if not parser_instance:
-        await update.message.reply_text("❌ Бот не инициализирован. Проверьте конфигурацию.")
+        await reply_text(update, "❌ Бот не инициализирован. Проверьте конфигурацию.")
         return
     
     if not context.args:
-        await update.message.reply_text("❌ Укажите канал для парсинга.\nПример: /parse_channel @rusven")
+        await reply_text(update, "❌ Укажите канал для парсинга.\nПример: /parse_channel @rusven")
         return
     
     channel = context.args[0]
@@ -176,51 +192,49 @@ async def parse_single_channel(update: Update, context: ContextTypes.DEFAULT_TYP
         channel = channel[1:]
     channel = '@' + channel
     
-    await update.message.reply_text(f"🔍 Парсинг канала {channel}...")
+    status = await reply_text(update, f"🔍 Парсинг канала {channel}...")
     
     try:
         limit = parser_config.get('limit', 100) if parser_config else 100
         results = await parser_instance.parse_channel(channel, limit=limit)
         
-        if not results:
-            await update.message.reply_text(f"⚠️ В канале {channel} не найдено релевантных сообщений.")
+        total = count_results(results)
+        if not total:
+            await edit_text(update, status, f"⚠️ В канале {channel} не найдено релевантных сообщений.")
             return
         
-        # Сохраняем результаты
-        filename = f'vc_projects_{update.message.chat_id}_{channel.replace("@", "")}.xlsx'
-        parser_instance.save_to_excel(results, filename)
+        # Книга собирается в памяти в фоновом потоке, без временного файла на диске
+        buffer = io.BytesIO()
+        await artifact_writer.submit(results, buffer)
         
         # Статистика
-        projects = [r for r in results if r['type'] == 'Проект']
-        investors = [r for r in results if r['type'] == 'Инвестор']
+        type_counts = Counter(results['type'])
         
         stats_message = f"""
 ✅ <b>Парсинг завершен!</b>
 
 📊 <b>Статистика по каналу {channel}:</b>
-• Всего найдено: {len(results)}
-• Проектов: {len(projects)}
-• Инвесторов: {len(investors)}
+• Всего найдено: {total}
+• Проектов: {type_counts['Проект']}
+• Инвесторов: {type_counts['Инвестор']}
 
 📁 Файл готовится...
         """
-        await update.message.reply_text(stats_message, parse_mode='HTML')
+        await edit_text(update, status, stats_message, parse_mode='HTML')
         
         # Отправляем файл
-        with open(filename, 'rb') as file:
-            await update.message.reply_document(
-                document=file,
-                filename=f'vc_projects_{channel.replace("@", "")}.xlsx',
-                caption=f'📊 Результаты парсинга канала {channel}'
-            )
-        
-        # Удаляем временный файл
-        if os.path.exists(filename):
-            os.remove(filename)
+        await reply_document(
+            update,
+            document=buffer.getvalue(),
+            filename=f'vc_projects_{channel.replace("@", "")}.xlsx',
+            caption=f'📊 Результаты парсинга канала {channel}'
+        )
             
+    except QueueFullError:
+        await edit_text(update, status, "🕒 Слишком много задач, подождите")
     except Exception as e:
         logger.error(f"Ошибка при парсинге канала {channel}: {e}")
-        await update.message.reply_text(f"❌ Ошибка при парсинге: {str(e)}\n\nПроверьте:\n• Правильность имени канала\n• Подписку на канал (если он приватный)")
+        await edit_text(update, status, f"❌ Ошибка при парсинге: {str(e)}\n\nПроверьте:\n• Правильность имени канала\n• Подписку на канал (если он приватный)")
 
 async def stats(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Показывает статистику"""
@@ -239,11 +253,11 @@ async def stats(update: Update, context: ContextTypes.DEFAULT_TYPE):
     else:
         stats_text += "Каналы не настроены"
     
-    await update.message.reply_text(stats_text, parse_mode='HTML')
+    await reply_text(update, stats_text, parse_mode='HTML')
 
 async def init_parser():
     """Инициализирует парсер"""
-    global parser_instance, parser_config
+    global parser_instance, parser_config, artifact_writer
     
     # Загружаем конфигурацию парсера
     parser_config = load_config()
@@ -257,15 +271,12 @@ async def init_parser():
         api_hash=parser_config['api_hash'],
         phone=parser_config['phone']
     )
+    artifact_writer = AsyncArtifactWriter(parser_instance.save_to_excel)
+    artifact_writer.start()
     
-    # Подключаемся к Telegram
-    try:
-        await parser_instance.connect()
-        logger.info("Парсер успешно инициализирован")
-        return True
-    except Exception as e:
-        logger.error(f"Ошибка при инициализации парсера: {e}")
-        return False
+    # К Telegram парсер подключится сам при первом /parse или /parse_channel
+    logger.info("Парсер успешно инициализирован")
+    return True
 
 def main():
     """Основная функция запуска бота"""
@@ -306,13 +317,19 @@ def main():
     
     application.post_init = post_init
     
+    async def post_shutdown(app: Application):
+        if artifact_writer:
+            await artifact_writer.close()
+    
+    application.post_shutdown = post_shutdown
+    
     # Добавляем обработчик ошибок
     async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE):
         """Обработчик ошибок"""
         logger.error(f"Ошибка при обработке обновления: {context.error}")
         if isinstance(update, Update) and update.message:
             try:
-                await update.message.reply_text("❌ Произошла ошибка. Попробуйте позже.")
+                await reply_text(update, "❌ Произошла ошибка. Попробуйте позже.")
             except:
                 pass
     
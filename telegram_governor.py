@@ -0,0 +1,114 @@
+"""
+Общий темп исходящих запросов к Telegram: token bucket на весь клиент,
+минимальный интервал между сообщениями в один чат и пауза ровно на
+retry_after / FloodWaitError.seconds вместо повторов вслепую.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+# Лимиты Bot API: около 30 сообщений в секунду на бота в целом
+# и не чаще 1 сообщения в секунду в один чат
+DEFAULT_PER_CHAT_INTERVAL = 1.0
+DEFAULT_GLOBAL_RATE = 30
+DEFAULT_GLOBAL_PERIOD = 1.0
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """
+    Сколько Telegram просит подождать, или None, если это не ограничение частоты.
+    Ошибки распознаются по атрибутам, чтобы не тянуть ни python-telegram-bot
+    (RetryAfter.retry_after — float или timedelta), ни Telethon (FloodWaitError.seconds).
+    """
+    value = getattr(error, 'retry_after', None)
+    if value is None and type(error).__name__.startswith('FloodWait'):
+        value = getattr(error, 'seconds', None)
+    if value is None:
+        return None
+    return value.total_seconds() if hasattr(value, 'total_seconds') else float(value)
+
+
+class TelegramGovernor:
+    """
+    Выдаёт «слоты» на запросы к Telegram.
+    slot() ждёт окончания паузы, свободного токена и интервала для чата;
+    если внутри слота прилетел RetryAfter/FloodWaitError, все последующие
+    запросы ставятся на паузу на указанное Telegram время.
+    """
+
+    def __init__(self, per_chat_interval: float = DEFAULT_PER_CHAT_INTERVAL,
+                 global_rate: int = DEFAULT_GLOBAL_RATE, global_period: float = DEFAULT_GLOBAL_PERIOD,
+                 max_concurrent: int = 4):
+        self.per_chat_interval = per_chat_interval
+        self.capacity = float(global_rate)
+        self.refill_rate = global_rate / global_period
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._pause_until = 0.0
+        self._chat_next: Dict[Any, float] = {}
+        self._lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+
+    def pause(self, seconds: float):
+        """Останавливает все запросы на seconds секунд (паузы не укорачиваются)"""
+        self._pause_until = max(self._pause_until, time.monotonic() + seconds)
+
+    def observe(self, error: BaseException) -> bool:
+        """Ставит паузу, если error — ограничение частоты; возвращает, было ли оно"""
+        seconds = retry_after_seconds(error)
+        if seconds is None:
+            return False
+        self.pause(seconds)
+        return True
+
+    async def _wait_chat(self, chat_id: Any):
+        # Резервируем следующее окно для чата сразу, без await между чтением и записью
+        now = time.monotonic()
+        start = max(now, self._chat_next.get(chat_id, 0.0))
+        self._chat_next[chat_id] = start + self.per_chat_interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    async def _take_token(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_rate)
+                self._updated = now
+                wait = self._pause_until - now
+                if self._tokens < 1:
+                    wait = max(wait, (1 - self._tokens) / self.refill_rate)
+                if wait <= 0:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep(wait)
+
+    async def acquire(self, chat_id: Optional[Any] = None):
+        """Ждёт права на один запрос (пауза, токен, интервал для чата)"""
+        if chat_id is not None:
+            await self._wait_chat(chat_id)
+        await self._take_token()
+
+    @asynccontextmanager
+    async def slot(self, chat_id: Optional[Any] = None):
+        """Один исходящий запрос; chat_id включает ограничение на чат"""
+        async with self._semaphore:
+            await self.acquire(chat_id)
+            try:
+                yield
+            except Exception as e:
+                self.observe(e)
+                raise
+
+    async def call(self, func: Callable[..., Awaitable], *args, chat_id: Optional[Any] = None,
+                   retries: int = 1, **kwargs):
+        """Вызывает func в слоте; после RetryAfter повторяет, дождавшись конца паузы"""
+        for attempt in range(retries + 1):
+            try:
+                async with self.slot(chat_id):
+                    return await func(*args, **kwargs)
+            except Exception as e:
+                if attempt == retries or retry_after_seconds(e) is None:
+                    raise
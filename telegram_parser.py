@@ -5,29 +5,255 @@
 
 import asyncio
 import re
-import json
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import BinaryIO, List, Dict, Optional, Tuple, Union
 import pandas as pd
 from telethon import TelegramClient
 from telethon.tl.types import Message
 import os
 
+from config_cache import load_json_cached
+from keyword_matcher import KeywordMatcher
+from parser_common import EXTRACT_BATCH_SIZE, MIN_POOL_BATCH, write_columns_xlsx, write_records_xlsx
+from telegram_governor import TelegramGovernor
+
+# Сколько каналов парсится одновременно (держимся ниже порога FloodWait)
+DEFAULT_PARALLEL = 4
+
+# С какого числа записей машиночитаемая выгрузка идёт в Parquet вместо CSV
+PARQUET_MIN_ROWS = 1000
+
+# Результаты хранятся по столбцам: имя поля -> значения по сообщениям.
+# Порядок столбцов — порядок в выгрузке.
+RESULT_COLUMNS = (
+    'date', 'channel', 'message_id', 'type', 'project_name', 'funding_amount',
+    'round_stage', 'investors', 'links', 'contacts', 'description', 'full_text',
+)
+ResultColumns = Dict[str, List]
+
+# (текст, дата, название канала, id сообщения) — всё, что нужно для извлечения
+MessagePayload = Tuple[str, Optional[str], str, int]
+# (поля сообщения, это проект, это инвестор, текст в нижнем регистре)
+Candidate = Tuple[MessagePayload, bool, bool, str]
+Results = Union[ResultColumns, List[Dict]]
+
+
+def new_result_columns() -> ResultColumns:
+    """Пустой набор результатов по столбцам"""
+    return {key: [] for key in RESULT_COLUMNS}
+
+
+def append_row(columns: ResultColumns, row: Tuple):
+    """Дописывает строку (значения в порядке RESULT_COLUMNS) в столбцы"""
+    for key, value in zip(RESULT_COLUMNS, row):
+        columns[key].append(value)
+
+
+def _message_payload(message: Message) -> MessagePayload:
+    """Достаёт из сообщения Telethon только то, что нужно для извлечения (без pickle всего Message)"""
+    return (
+        message.text,
+        message.date.strftime('%Y-%m-%d %H:%M:%S') if message.date else None,
+        message.chat.title if hasattr(message.chat, 'title') else 'Unknown',
+        message.id,
+    )
+
+
+def count_results(data: Results) -> int:
+    """Число записей и для столбцов, и для списка словарей"""
+    if isinstance(data, dict):
+        return len(data['message_id'])
+    return len(data)
+
+# Регулярные выражения компилируются один раз при импорте модуля.
+# Порядок паттернов в списках — это приоритет: берётся первый сработавший.
+PROJECT_NAME_PATTERNS = [
+    re.compile(r'стартап[:\s]+([А-ЯЁA-Z][А-ЯЁа-яёA-Za-z\s]+)', re.IGNORECASE),
+    re.compile(r'проект[:\s]+([А-ЯЁA-Z][А-ЯЁа-яёA-Za-z\s]+)', re.IGNORECASE),
+    re.compile(r'компания[:\s]+([А-ЯЁA-Z][А-ЯЁа-яёA-Za-z\s]+)', re.IGNORECASE),
+    re.compile(r'([А-ЯЁA-Z][А-ЯЁа-яёA-Za-z\s]{3,20})\s+(привлек|привлекает|раунд)', re.IGNORECASE),
+]
+
+# Паттерны для сумм в разных валютах
+FUNDING_PATTERNS = [
+    re.compile(r'(\$[\d,\.]+[KMB]?)\s*(доллар|usd|dollar)', re.IGNORECASE),
+    re.compile(r'(\d+[\s,\.]?\d*[\s,\.]?\d*)\s*(млн|миллион|million|млрд|миллиард|billion)', re.IGNORECASE),
+    re.compile(r'(\$[\d,\.]+[KMB]?)', re.IGNORECASE),
+    re.compile(r'(\d+[\s,\.]?\d*[\s,\.]?\d*)\s*(рубл|rub|₽)', re.IGNORECASE),
+]
+
+ROUND_STAGES = {
+    'pre-seed': ['pre-seed', 'пре-сид', 'пресид'],
+    'seed': ['seed', 'сид', 'посевной'],
+    'series a': ['series a', 'серия а', 'раунд а'],
+    'series b': ['series b', 'серия б', 'раунд б'],
+    'series c': ['series c', 'серия с', 'раунд с'],
+    'angel': ['angel', 'ангел', 'ангельский'],
+}
+
+INVESTORS_PATTERNS = [
+    re.compile(r'инвестор[ы]?[:\s]+([А-ЯЁA-Z][А-ЯЁа-яёA-Za-z\s,]+)', re.IGNORECASE),
+    re.compile(r'фонд[ы]?[:\s]+([А-ЯЁA-Z][А-ЯЁа-яёA-Za-z\s,]+)', re.IGNORECASE),
+    re.compile(r'при участии[:\s]+([А-ЯЁA-Z][А-ЯЁа-яёA-Za-z\s,]+)', re.IGNORECASE),
+]
+
+EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+TME_RE = re.compile(r't\.me/[a-zA-Z0-9_]+')
+
+# Ссылки, email и @username за один проход; вид токена — в match.lastgroup
+LINK_TOKEN_RE = re.compile(
+    r'(?P<url>https?://[^\s]+|www\.[^\s]+|t\.me/[^\s]+)'
+    r'|(?P<email>[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})'
+    r'|(?P<telegram>@[a-zA-Z0-9_]+)'
+)
+
+
+def keywords_pattern(keywords: List[str]) -> re.Pattern:
+    """Одна регулярка-альтернатива вместо цикла any(keyword in text ...)"""
+    return re.compile('|'.join(map(re.escape, keywords)))
+
+
+# Одна регулярка на стадию; ищем по тексту в нижнем регистре, как и раньше
+ROUND_STAGE_PATTERNS = {stage: keywords_pattern(keywords) for stage, keywords in ROUND_STAGES.items()}
+
 # Загрузка конфигурации
 def load_config():
     """Загружает конфигурацию из файла config.json"""
     try:
-        with open('config.json', 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return load_json_cached('config.json')
     except FileNotFoundError:
         print("⚠️ Файл config.json не найден!")
         print("Создайте файл config.json с вашими API ключами")
         return None
 
-class TelegramVCParser:
+class TelegramVCExtractor:
+    """
+    Извлечение полей из текста сообщения.
+    Не зависит от Telegram-клиента, поэтому работает и в процессах пула.
+    """
+    
+    def extract_row(self, payload: MessagePayload, is_project: bool, is_investor: bool,
+                    text_lower: str) -> Tuple:
+        """
+        Извлекает информацию из сообщения
+        
+        Args:
+            payload: Поля сообщения (см. _message_payload)
+            is_project: Флаг, что это проект
+            is_investor: Флаг, что это инвестор
+            text_lower: Текст сообщения в нижнем регистре
+        
+        Returns:
+            Значения в порядке RESULT_COLUMNS
+        """
+        text, date, channel, message_id = payload
+        
+        # Извлечение названия проекта/компании
+        project_name = self.extract_project_name(text)
+        
+        # Извлечение суммы инвестиций
+        funding_amount = self.extract_funding_amount(text)
+        
+        # Извлечение стадии раунда
+        round_stage = self.extract_round_stage(text_lower)
+        
+        # Извлечение инвесторов
+        investors = self.extract_investors(text)
+        
+        # Извлечение ссылок и контактов
+        links, contacts = self.extract_links_and_contacts(text)
+        
+        # Извлечение описания
+        description = text[:500] if len(text) > 500 else text
+        
+        return (
+            date,
+            channel,
+            message_id,
+            'Проект' if is_project else ('Инвестор' if is_investor else 'Другое'),
+            project_name,
+            funding_amount,
+            round_stage,
+            investors,
+            links,
+            contacts,
+            description,
+            text,
+        )
+    
+    def extract_project_name(self, text: str) -> Optional[str]:
+        """Извлекает название проекта из текста"""
+        for pattern in PROJECT_NAME_PATTERNS:
+            match = pattern.search(text)
+            if match:
+                return match.group(1).strip()
+        
+        return None
+    
+    def extract_funding_amount(self, text: str) -> Optional[str]:
+        """Извлекает сумму инвестиций"""
+        for pattern in FUNDING_PATTERNS:
+            match = pattern.search(text)
+            if match:
+                return match.group(0).strip()
+        
+        return None
+    
+    def extract_round_stage(self, text_lower: str) -> Optional[str]:
+        """Извлекает стадию раунда (текст уже в нижнем регистре)"""
+        for stage, pattern in ROUND_STAGE_PATTERNS.items():
+            if pattern.search(text_lower):
+                return stage
+        
+        return None
+    
+    def extract_investors(self, text: str) -> Optional[str]:
+        """Извлекает имена инвесторов"""
+        investors = []
+        for pattern in INVESTORS_PATTERNS:
+            investors.extend(pattern.findall(text))
+        
+        return ', '.join(investors) if investors else None
+    
+    def extract_links_and_contacts(self, text: str) -> Tuple[Optional[str], Optional[str]]:
+        """Извлекает ссылки и контакты (email, telegram) за один проход по тексту"""
+        links, emails, telegrams = [], [], []
+        for match in LINK_TOKEN_RE.finditer(text):
+            kind = match.lastgroup
+            token = match.group(0)
+            if kind == 'url':
+                links.append(token)
+                # Контакты внутри ссылки ищем только по самой ссылке
+                emails.extend(EMAIL_RE.findall(token))
+                telegrams.extend(TME_RE.findall(token))
+            elif kind == 'email':
+                emails.append(token)
+            else:
+                telegrams.append(token)
+        
+        contacts = emails + telegrams
+        return (', '.join(links) if links else None,
+                ', '.join(contacts) if contacts else None)
+
+
+_worker_extractor: Optional[TelegramVCExtractor] = None
+
+
+def _extract_batch(batch: List[Candidate]) -> List[Tuple]:
+    """Обрабатывает пачку сообщений в процессе пула"""
+    global _worker_extractor
+    if _worker_extractor is None:
+        _worker_extractor = TelegramVCExtractor()
+    return [_worker_extractor.extract_row(*item) for item in batch]
+
+
+class TelegramVCParser(TelegramVCExtractor):
     """Класс для парсинга венчурных каналов в Telegram"""
     
-    def __init__(self, api_id: int, api_hash: str, phone: str):
+    def __init__(self, api_id: int, api_hash: str, phone: str,
+                 governor: Optional[TelegramGovernor] = None):
         """
         Инициализация клиента Telegram
         
@@ -35,12 +261,23 @@ class TelegramVCParser:
             api_id: API ID из my.telegram.org
             api_hash: API Hash из my.telegram.org
             phone: Номер телефона в формате +7XXXXXXXXXX
+            governor: Темп запросов клиента; у пользовательского аккаунта
+                свои лимиты, поэтому по умолчанию — отдельный экземпляр
         """
         self.api_id = api_id
         self.api_hash = api_hash
         self.phone = phone
         self.client = TelegramClient('vc_parser_session', api_id, api_hash)
         
+        # Подключение откладывается до первого парсинга
+        self._connected = False
+        self._connect_lock = asyncio.Lock()
+        # Уже разрешённые каналы: username -> InputPeer
+        self._entity_cache: Dict[str, object] = {}
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_failed = False
+        self.governor = governor or TelegramGovernor(max_concurrent=DEFAULT_PARALLEL)
+        
         # Ключевые слова для поиска проектов
         self.project_keywords = [
             'стартап', 'startup', 'проект', 'раунд', 'round', 'инвестиции',
@@ -55,13 +292,34 @@ class TelegramVCParser:
             'venture capital', 'angel', 'ангел', 'акселератор', 'accelerator',
             'инвестирует', 'invests', 'portfolio', 'портфель'
         ]
+        
+        # Проверка «есть ли хоть одно слово» — автомат Ахо-Корасик, если установлен pyahocorasick
+        self._project_matcher = KeywordMatcher((kw, 'project') for kw in self.project_keywords)
+        self._investor_matcher = KeywordMatcher((kw, 'investor') for kw in self.investor_keywords)
     
     async def connect(self):
         """Подключение к Telegram"""
         await self.client.start(phone=self.phone)
+        self._connected = True
         print("✅ Успешно подключено к Telegram!")
     
-    async def parse_channel(self, channel_username: str, limit: int = 100) -> List[Dict]:
+    async def _ensure_connected(self):
+        """Подключается при первом обращении; параллельные вызовы ждут одно подключение"""
+        if self._connected:
+            return
+        async with self._connect_lock:
+            if not self._connected:
+                await self.connect()
+    
+    async def _get_peer(self, channel_username: str):
+        """Разрешает username канала в InputPeer один раз и запоминает результат"""
+        peer = self._entity_cache.get(channel_username)
+        if peer is None:
+            peer = await self.governor.call(self.client.get_input_entity, channel_username)
+            self._entity_cache[channel_username] = peer
+        return peer
+    
+    async def parse_channel(self, channel_username: str, limit: int = 100) -> ResultColumns:
         """
         Парсит сообщения из канала
         
@@ -70,204 +328,125 @@ class TelegramVCParser:
             limit: Максимальное количество сообщений для парсинга
         
         Returns:
-            Список словарей с информацией о найденных проектах/инвесторах
+            Столбцы (RESULT_COLUMNS) с информацией о найденных проектах/инвесторах
         """
-        results = []
+        results = new_result_columns()
+        candidates: List[Candidate] = []
         
         try:
             print(f"🔍 Парсинг канала: {channel_username}")
+            await self._ensure_connected()
             
-            # Получаем сообщения из канала
-            messages = await self.client.get_messages(channel_username, limit=limit)
+            # Сообщения приходят страницами и разбираются по мере получения
+            peer = await self._get_peer(channel_username)
+            seen = 0
             
-            print(f"📨 Найдено {len(messages)} сообщений")
-            
-            for message in messages:
+            # Страницы истории Telethon запрашивает сам; governor держит общую паузу
+            # после FloodWait и не даёт начать скан, пока она не закончилась
+            await self.governor.acquire()
+            async for message in self.client.iter_messages(peer, limit=limit):
+                seen += 1
                 if not message.text:
                     continue
                 
+                # Нижний регистр считается один раз и передаётся дальше в extract_row
                 text = message.text.lower()
                 
                 # Проверяем, содержит ли сообщение информацию о проекте
-                is_project = any(keyword in text for keyword in self.project_keywords)
-                is_investor = any(keyword in text for keyword in self.investor_keywords)
+                is_project = self._project_matcher.search(text)
+                is_investor = self._investor_matcher.search(text)
                 
                 if is_project or is_investor:
-                    parsed_data = self.extract_info(message, is_project, is_investor)
-                    if parsed_data:
-                        results.append(parsed_data)
+                    candidates.append((_message_payload(message), is_project, is_investor, text))
+            
+            for row in await self._extract_candidates(candidates):
+                append_row(results, row)
             
-            print(f"✅ Найдено {len(results)} релевантных сообщений")
+            print(f"📨 Просмотрено {seen} сообщений")
+            print(f"✅ Найдено {len(candidates)} релевантных сообщений")
             
         except Exception as e:
+            # FloodWait ставит на паузу и следующие запросы к Telegram
+            self.governor.observe(e)
             print(f"❌ Ошибка при парсинге канала {channel_username}: {e}")
         
         return results
     
-    def extract_info(self, message: Message, is_project: bool, is_investor: bool) -> Optional[Dict]:
-        """
-        Извлекает информацию из сообщения
-        
-        Args:
-            message: Объект сообщения Telegram
-            is_project: Флаг, что это проект
-            is_investor: Флаг, что это инвестор
-        
-        Returns:
-            Словарь с извлеченной информацией
-        """
-        text = message.text
-        
-        # Извлечение названия проекта/компании
-        project_name = self.extract_project_name(text)
-        
-        # Извлечение суммы инвестиций
-        funding_amount = self.extract_funding_amount(text)
-        
-        # Извлечение стадии раунда
-        round_stage = self.extract_round_stage(text)
-        
-        # Извлечение инвесторов
-        investors = self.extract_investors(text)
-        
-        # Извлечение ссылок
-        links = self.extract_links(text)
-        
-        # Извлечение контактов
-        contacts = self.extract_contacts(text)
-        
-        # Извлечение описания
-        description = text[:500] if len(text) > 500 else text
-        
-        return {
-            'date': message.date.strftime('%Y-%m-%d %H:%M:%S') if message.date else None,
-            'channel': message.chat.title if hasattr(message.chat, 'title') else 'Unknown',
-            'message_id': message.id,
-            'type': 'Проект' if is_project else ('Инвестор' if is_investor else 'Другое'),
-            'project_name': project_name,
-            'funding_amount': funding_amount,
-            'round_stage': round_stage,
-            'investors': investors,
-            'links': links,
-            'contacts': contacts,
-            'description': description,
-            'full_text': text
-        }
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        """Создаёт пул процессов при первом обращении (на некоторых хостингах он недоступен)"""
+        if self._pool is None and not self._pool_failed:
+            try:
+                self._pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+            except (OSError, NotImplementedError) as e:
+                print(f"⚠️ Пул процессов недоступен, извлекаем данные в основном процессе: {e}")
+                self._pool_failed = True
+        return self._pool
     
-    def extract_project_name(self, text: str) -> Optional[str]:
-        """Извлекает название проекта из текста"""
-        # Паттерны для поиска названий
-        patterns = [
-            r'стартап[:\s]+([А-ЯЁA-Z][А-ЯЁа-яёA-Za-z\s]+)',
-            r'проект[:\s]+([А-ЯЁA-Z][А-ЯЁа-яёA-Za-z\s]+)',
-            r'компания[:\s]+([А-ЯЁA-Z][А-ЯЁа-яёA-Za-z\s]+)',
-            r'([А-ЯЁA-Z][А-ЯЁа-яёA-Za-z\s]{3,20})\s+(привлек|привлекает|раунд)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(1).strip()
-        
-        return None
-    
-    def extract_funding_amount(self, text: str) -> Optional[str]:
-        """Извлекает сумму инвестиций"""
-        # Паттерны для сумм в разных валютах
-        patterns = [
-            r'(\$[\d,\.]+[KMB]?)\s*(доллар|usd|dollar)',
-            r'(\d+[\s,\.]?\d*[\s,\.]?\d*)\s*(млн|миллион|million|млрд|миллиард|billion)',
-            r'(\$[\d,\.]+[KMB]?)',
-            r'(\d+[\s,\.]?\d*[\s,\.]?\d*)\s*(рубл|rub|₽)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(0).strip()
-        
-        return None
-    
-    def extract_round_stage(self, text: str) -> Optional[str]:
-        """Извлекает стадию раунда"""
-        stages = {
-            'pre-seed': ['pre-seed', 'пре-сид', 'пресид'],
-            'seed': ['seed', 'сид', 'посевной'],
-            'series a': ['series a', 'серия а', 'раунд а'],
-            'series b': ['series b', 'серия б', 'раунд б'],
-            'series c': ['series c', 'серия с', 'раунд с'],
-            'angel': ['angel', 'ангел', 'ангельский'],
-        }
-        
-        text_lower = text.lower()
-        for stage, keywords in stages.items():
-            if any(keyword in text_lower for keyword in keywords):
-                return stage
-        
-        return None
+    async def _extract_candidates(self, candidates: List[Candidate]) -> List[Tuple]:
+        """Извлекает строки из отобранных сообщений, по возможности в пуле процессов"""
+        pool = self._get_pool() if len(candidates) >= MIN_POOL_BATCH else None
+        if pool is None:
+            return [self.extract_row(*item) for item in candidates]
+        
+        loop = asyncio.get_running_loop()
+        batches = [candidates[i:i + EXTRACT_BATCH_SIZE] for i in range(0, len(candidates), EXTRACT_BATCH_SIZE)]
+        extracted = await asyncio.gather(*(loop.run_in_executor(pool, _extract_batch, batch) for batch in batches))
+        return [row for batch in extracted for row in batch]
     
-    def extract_investors(self, text: str) -> Optional[str]:
-        """Извлекает имена инвесторов"""
-        patterns = [
-            r'инвестор[ы]?[:\s]+([А-ЯЁA-Z][А-ЯЁа-яёA-Za-z\s,]+)',
-            r'фонд[ы]?[:\s]+([А-ЯЁA-Z][А-ЯЁа-яёA-Za-z\s,]+)',
-            r'при участии[:\s]+([А-ЯЁA-Z][А-ЯЁа-яёA-Za-z\s,]+)',
-        ]
+    async def parse_multiple_channels(self, channel_usernames: List[str], limit: int = 100,
+                                      max_concurrency: int = DEFAULT_PARALLEL) -> ResultColumns:
+        """Парсит несколько каналов параллельно, не больше max_concurrency одновременно"""
+        semaphore = asyncio.Semaphore(max_concurrency)
         
-        investors = []
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            investors.extend(matches)
+        async def _one(channel: str) -> ResultColumns:
+            async with semaphore:
+                return await self.parse_channel(channel, limit)
         
-        return ', '.join(investors) if investors else None
-    
-    def extract_links(self, text: str) -> Optional[str]:
-        """Извлекает ссылки из текста"""
-        url_pattern = r'https?://[^\s]+|www\.[^\s]+|t\.me/[^\s]+'
-        links = re.findall(url_pattern, text)
-        return ', '.join(links) if links else None
-    
-    def extract_contacts(self, text: str) -> Optional[str]:
-        """Извлекает контакты (email, telegram)"""
-        email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-        telegram_pattern = r'@[a-zA-Z0-9_]+|t\.me/[a-zA-Z0-9_]+'
+        results = await asyncio.gather(*(_one(channel) for channel in channel_usernames), return_exceptions=True)
         
-        emails = re.findall(email_pattern, text)
-        telegrams = re.findall(telegram_pattern, text)
-        
-        contacts = emails + telegrams
-        return ', '.join(contacts) if contacts else None
-    
-    async def parse_multiple_channels(self, channel_usernames: List[str], limit: int = 100) -> List[Dict]:
-        """Парсит несколько каналов"""
-        all_results = []
-        
-        for channel in channel_usernames:
-            results = await self.parse_channel(channel, limit)
-            all_results.extend(results)
-            await asyncio.sleep(2)  # Пауза между каналами
+        all_results = new_result_columns()
+        for channel, channel_results in zip(channel_usernames, results):
+            if isinstance(channel_results, Exception):
+                print(f"❌ Ошибка при парсинге канала {channel}: {channel_results}")
+                continue
+            for key, values in channel_results.items():
+                all_results[key].extend(values)
         
         return all_results
     
-    def save_to_excel(self, data: List[Dict], filename: str = 'vc_projects.xlsx'):
-        """Сохраняет данные в Excel файл"""
-        if not data:
+    def save_to_excel(self, data: Results, filename: Union[str, BinaryIO] = 'vc_projects.xlsx'):
+        """Сохраняет данные в Excel: в файл по пути или в переданный буфер (например, io.BytesIO)"""
+        if not count_results(data):
             print("⚠️ Нет данных для сохранения")
             return
         
-        df = pd.DataFrame(data)
-        df.to_excel(filename, index=False, engine='openpyxl')
-        print(f"✅ Данные сохранены в {filename}")
+        # Строки пишутся потоком, без DataFrame и полной книги в памяти
+        if isinstance(data, dict):
+            write_columns_xlsx(filename, data)
+        else:
+            write_records_xlsx(filename, {'Sheet1': data})
+        if isinstance(filename, str):
+            print(f"✅ Данные сохранены в {filename}")
     
-    def save_to_csv(self, data: List[Dict], filename: str = 'vc_projects.csv'):
+    def save_to_csv(self, data: Results, filename: str = 'vc_projects.csv'):
         """Сохраняет данные в CSV файл"""
-        if not data:
+        if not count_results(data):
             print("⚠️ Нет данных для сохранения")
             return
         
-        df = pd.DataFrame(data)
+        df = pd.DataFrame(data, copy=False)
         df.to_csv(filename, index=False, encoding='utf-8-sig')
         print(f"✅ Данные сохранены в {filename}")
+    
+    def save_to_parquet(self, data: Results, filename: str = 'vc_projects.parquet'):
+        """Сохраняет данные в Parquet (без ограничений Excel на длину ячейки)"""
+        if not count_results(data):
+            print("⚠️ Нет данных для сохранения")
+            return
+        
+        df = pd.DataFrame(data, copy=False)
+        df.to_parquet(filename, index=False, engine='pyarrow', compression='zstd')
+        print(f"✅ Данные сохранены в {filename}")
 
 
 async def main():
@@ -303,19 +482,26 @@ async def main():
     
     # Парсинг каналов
     print(f"\n📋 Начинаю парсинг {len(channels)} каналов...")
-    results = await parser.parse_multiple_channels(channels, limit=config.get('limit', 100))
+    results = await parser.parse_multiple_channels(
+        channels,
+        limit=config.get('limit', 100),
+        max_concurrency=config.get('parallel', DEFAULT_PARALLEL)
+    )
     
     # Сохранение результатов
-    if results:
+    total = count_results(results)
+    if total:
         parser.save_to_excel(results, 'vc_projects.xlsx')
-        parser.save_to_csv(results, 'vc_projects.csv')
+        if total > PARQUET_MIN_ROWS:
+            parser.save_to_parquet(results, 'vc_projects.parquet')
+        else:
+            parser.save_to_csv(results, 'vc_projects.csv')
         
         print(f"\n📊 Статистика:")
-        print(f"  Всего найдено записей: {len(results)}")
-        projects = [r for r in results if r['type'] == 'Проект']
-        investors = [r for r in results if r['type'] == 'Инвестор']
-        print(f"  Проектов: {len(projects)}")
-        print(f"  Инвесторов: {len(investors)}")
+        print(f"  Всего найдено записей: {total}")
+        type_counts = Counter(results['type'])
+        print(f"  Проектов: {type_counts['Проект']}")
+        print(f"  Инвесторов: {type_counts['Инвестор']}")
     else:
         print("\n⚠️ Не найдено релевантных сообщений")
     
@@ -2,23 +2,21 @@
 # -*- coding: utf-8 -*-
 """Test script to check syntax of financial_model.py"""
 
+import py_compile
 import sys
 
 try:
-    with open('financial_model.py', 'r', encoding='utf-8') as f:
-        code = f.read()
-    
-    compile(code, 'financial_model.py', 'exec')
+    # Только проверка синтаксиса: запуск как __main__ (run_model.bat) байткод
+    # из __pycache__ не использует, модель всё равно компилируется заново
+    py_compile.compile('financial_model.py', doraise=True)
     print("✓ Синтаксис файла корректен!")
     print("✓ Файл готов к запуску")
-except SyntaxError as e:
-    print(f"✗ Синтаксическая ошибка на строке {e.lineno}:")
-    print(f"  {e.text}")
-    print(f"  {e.msg}")
+except py_compile.PyCompileError as e:
+    error = e.exc_value
+    print(f"✗ Синтаксическая ошибка на строке {getattr(error, 'lineno', '?')}:")
+    print(f"  {getattr(error, 'text', '')}")
+    print(f"  {getattr(error, 'msg', e.msg)}")
     sys.exit(1)
 except Exception as e:
     print(f"✗ Ошибка: {e}")
     sys.exit(1)
-
-
-